@@ -0,0 +1,60 @@
+import os
+import pygame
+
+from game.config import BATTLE_DIR, OVERWORLD_DIR, TILES_DIR
+
+IMAGE_EXTS = (".png",)
+PRELOAD_DIRS = (BATTLE_DIR, OVERWORLD_DIR, TILES_DIR)
+
+
+class AssetRegistry:
+    """Process-wide image cache: each file is decoded once and the surface is shared."""
+
+    def __init__(self):
+        self.images = {}   # normalized path -> Surface
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path):
+        key = os.path.normpath(path)
+        img = self.images.get(key)
+        if img is not None:
+            self.hits += 1
+            return img
+
+        self.misses += 1
+        img = pygame.image.load(key).convert_alpha()
+        self.images[key] = img
+        return img
+
+    def preload(self, directory):
+        """Decode every image under directory up front (needs a display mode set)."""
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if not name.lower().endswith(IMAGE_EXTS):
+                    continue
+                key = os.path.normpath(os.path.join(root, name))
+                if key in self.images:
+                    continue
+                self.misses += 1
+                self.images[key] = pygame.image.load(key).convert_alpha()
+
+    def stats(self):
+        return {"images": len(self.images), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        self.images.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+assets = AssetRegistry()
+
+
+def load_image(path):
+    return assets.image(path)
+
+
+def preload_images(dirs=PRELOAD_DIRS):
+    for d in dirs:
+        assets.preload(d)
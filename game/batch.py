@@ -0,0 +1,56 @@
+"""Vectorized versions of the game.engine rules (needs numpy).
+
+Every function here matches its scalar counterpart element-wise:
+
+    batch_damage          <-> engine.roll_damage
+    batch_capture_chance  <-> engine.capture_chance
+    batch_capture         <-> engine.try_capture
+
+Inputs are anything numpy can broadcast (lists, arrays, scalars). `rng` is
+a numpy Generator, a seed, or None for fresh entropy. Pass `jitter` /
+`rolls` explicitly to evaluate with known random draws.
+"""
+try:
+    import numpy as np
+except ImportError:   # optional dependency: only balance/AI tooling needs it
+    np = None
+
+from game.engine import CAPTURE_MIN, CAPTURE_MAX
+
+
+def _numpy():
+    if np is None:
+        raise ImportError("game.batch needs numpy (pip install numpy)")
+    return np
+
+
+def _rng(rng):
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng)
+
+
+def batch_damage(atk, dfn, power, rng=None, jitter=None):
+    """Damage for every (atk, dfn, power) triple, floored at 1."""
+    np = _numpy()
+    base = (np.asarray(power, dtype=np.int64)
+            + np.asarray(atk, dtype=np.int64)
+            - np.asarray(dfn, dtype=np.int64))
+    if jitter is None:
+        jitter = _rng(rng).integers(-2, 3, size=base.shape)
+    return np.maximum(1, base + jitter)
+
+
+def batch_capture_chance(hp, max_hp):
+    np = _numpy()
+    hp = np.asarray(hp, dtype=np.float64)
+    max_hp = np.asarray(max_hp, dtype=np.float64)
+    return np.clip(1 - hp / max_hp, CAPTURE_MIN, CAPTURE_MAX)
+
+
+def batch_capture(hp, max_hp, rng=None, rolls=None):
+    """Boolean array: which throws catch their target."""
+    chance = batch_capture_chance(hp, max_hp)
+    if rolls is None:
+        rolls = _rng(rng).random(chance.shape)
+    return rolls < chance
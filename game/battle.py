@@ -1,5 +1,50 @@
-import pygame, random
-from game.creatures import calculate_damage
+import pygame
+from game.engine import STRUGGLE, BALL, WIN, LOSS, CAPTURED, Bout, play_turn
+from game.fonts import render_text
+
+PANEL_H = 150
+BORDER = 4
+
+_scene_layers = {}   # (W, H) -> (background, panel); only the current size is kept
+
+
+def bake_scene_layers(W, H):
+    # Background (fill ALL of the screen)
+    background = pygame.Surface((W, H)).convert()
+    background.fill((140, 160, 220))  # sky
+
+    # --- Ground planes (positioned relative to screen size) ---
+    # Player ground (lower-left area)
+    pygame.draw.ellipse(
+        background, (60, 130, 60),
+        (int(W * 0.08), int(H * 0.58), int(W * 0.42), int(H * 0.12))
+    )
+
+    # Enemy ground (upper-right area)
+    pygame.draw.ellipse(
+        background, (60, 130, 60),
+        (int(W * 0.55), int(H * 0.26), int(W * 0.36), int(H * 0.10))
+    )
+
+    # Bottom UI panel frame + hint line
+    panel = pygame.Surface((W, PANEL_H)).convert()
+    pygame.draw.rect(panel, (20, 20, 60), (0, 0, W, PANEL_H))
+    pygame.draw.rect(panel, (255, 255, 255), (0, 0, W, PANEL_H), BORDER)
+    panel.blit(
+        render_text("WASD/Arrows • Enter select • Backspace/Esc back", 22, (210, 210, 210)),
+        (16, 6)
+    )
+    return background, panel
+
+
+def get_scene_layers(size):
+    layers = _scene_layers.get(size)
+    if layers is None:
+        # window size changed (or first battle): rebuild
+        _scene_layers.clear()
+        layers = bake_scene_layers(*size)
+        _scene_layers[size] = layers
+    return layers
 
 
 class Battle:
@@ -82,24 +127,15 @@ class Battle:
 
             # ---------------- FIGHT ----------------
             if self.state == "fight":
-                moves = self.player.moves if self.player.moves else [{"name": "Struggle", "power": 10}]
-                self.player.moves = moves
+                moves = self.player.moves or STRUGGLE
 
                 if k in (pygame.K_LEFT, pygame.K_a):
                     self.move_cursor = (self.move_cursor - 1) % len(moves)
                 elif k in (pygame.K_RIGHT, pygame.K_d):
                     self.move_cursor = (self.move_cursor + 1) % len(moves)
                 elif k in (pygame.K_RETURN, pygame.K_SPACE):
-                    move = moves[self.move_cursor]
-                    dmg = calculate_damage(self.player, self.enemy, move)
-                    self.enemy.hp = max(0, self.enemy.hp - dmg)
-
-                    if self.enemy.hp <= 0:
-                        self.message = f"{self.enemy.name} fainted!"
-                        self.state = "message"
-                    else:
-                        self.enemy_attack()
-
+                    outcome = self.play_turn(self.move_cursor)
+                    self.show_turn(outcome)
                     self.key_cd = 0.18
                 return
 
@@ -130,8 +166,8 @@ class Battle:
                             self.state = "message"
                         else:
                             self.inventory.capture_balls -= 1
-                            chance = max(0.05, min(0.85, 1 - self.enemy.hp / self.enemy.max_hp))
-                            if random.random() < chance:
+                            outcome = self.play_turn(BALL)
+                            if outcome == CAPTURED:
                                 self.message = f"You caught {self.enemy.name}!"
                                 self.inventory.add_to_party(self.enemy)
                                 self.state = "message"
@@ -142,7 +178,7 @@ class Battle:
 
                             else:
                                 self.message = "It broke free!"
-                                self.enemy_attack()
+                                self.show_turn(outcome)
 
                     self.key_cd = 0.18
                 return
@@ -161,20 +197,20 @@ class Battle:
 
     # -----------------------------------------------------
 
-    def enemy_attack(self):
-        # Refresh active creature
-        self.player = self.inventory.active
-
-        # Emergency move fallback
-        if not self.enemy.moves:
-            self.enemy.moves = [{"name": "Struggle", "power": 10}]
+    def play_turn(self, action):
+        bout = Bout(self.player, self.enemy)
+        outcome = play_turn(bout, action)
+        bout.store(self.player, self.enemy)
+        return outcome
 
-        move = random.choice(self.enemy.moves)
-        dmg = calculate_damage(self.enemy, self.player, move)
-        self.player.hp = max(0, self.player.hp - dmg)
+    def show_turn(self, outcome):
+        # Turn rules live in engine.play_turn; this only picks what to show
+        if outcome == WIN:
+            self.message = f"{self.enemy.name} fainted!"
+            self.state = "message"
 
         # If active fainted, force party switch
-        if self.player.hp <= 0:
+        elif outcome == LOSS:
 
             # Are there any living creatures left?
             if self.inventory.has_usable():
@@ -196,13 +232,20 @@ class Battle:
 
     # -----------------------------------------------------
 
+    def view_key(self):
+        # what draw() depends on
+        return (self.state, self.menu_cursor, self.move_cursor, self.bag_cursor,
+                self.message, id(self.player), self.player.hp, self.enemy.hp,
+                self.inventory.potions, self.inventory.capture_balls)
+
+    # -----------------------------------------------------
+
     def draw_hp_bar(self, name, hp, maxhp, x, y):
         maxhp = max(1, maxhp)
         hp = max(0, min(hp, maxhp))
         pygame.draw.rect(self.screen,(0,0,0),(x,y,220,22))
         pygame.draw.rect(self.screen,(0,200,0),(x+2,y+2,int((hp/maxhp)*216),18))
-        font = pygame.font.SysFont(None,22)
-        self.screen.blit(font.render(f"{name} {hp}/{maxhp}",True,(0,0,0)),(x,y-20))
+        self.screen.blit(render_text(f"{name} {hp}/{maxhp}",22,(0,0,0)),(x,y-20))
 
     # -----------------------------------------------------
 
@@ -211,47 +254,25 @@ class Battle:
         W, H = self.screen.get_size()
 
         # Layout constants
-        PANEL_H = 150
         PANEL_Y = H - PANEL_H
-        BORDER = 4
-
-        # Background (fill ALL of the screen)
-        self.screen.fill((140, 160, 220))  # sky
 
-        # --- Ground planes (positioned relative to screen size) ---
-        # Player ground (lower-left area)
-        pygame.draw.ellipse(
-            self.screen, (60, 130, 60),
-            (int(W * 0.08), int(H * 0.58), int(W * 0.42), int(H * 0.12))
-        )
-
-        # Enemy ground (upper-right area)
-        pygame.draw.ellipse(
-            self.screen, (60, 130, 60),
-            (int(W * 0.55), int(H * 0.26), int(W * 0.36), int(H * 0.10))
-        )
+        # Static layers (sky, ground planes, bottom panel) are baked once
+        # per window size; only sprites, HP bars and menu text are live
+        background, panel = get_scene_layers((W, H))
+        self.screen.blit(background, (0, 0))
 
         # --- Enemy ---
         self.draw_hp_bar(self.enemy.name, self.enemy.hp, self.enemy.max_hp, int(W * 0.52), int(H * 0.06))
-        enemy_sprite = pygame.transform.scale(self.enemy.sprite, (160, 160))
+        enemy_sprite = self.enemy.scaled_sprite((160, 160))
         self.screen.blit(enemy_sprite, (int(W * 0.62), int(H * 0.18)))
 
         # --- Player ---
         self.draw_hp_bar(self.player.name, self.player.hp, self.player.max_hp, int(W * 0.10), int(H * 0.36))
-        player_sprite = pygame.transform.scale(self.player.sprite, (180, 180))
+        player_sprite = self.player.scaled_sprite((180, 180))
         self.screen.blit(player_sprite, (int(W * 0.12), int(H * 0.44)))
 
         # --- Bottom UI Panel (ALWAYS at the bottom, no matter window size) ---
-        pygame.draw.rect(self.screen, (20, 20, 60), (0, PANEL_Y, W, PANEL_H))
-        pygame.draw.rect(self.screen, (255, 255, 255), (0, PANEL_Y, W, PANEL_H), BORDER)
-
-        font = pygame.font.SysFont(None, 36)
-        hint = pygame.font.SysFont(None, 22)
-
-        self.screen.blit(
-            hint.render("WASD/Arrows • Enter select • Backspace/Esc back", True, (210, 210, 210)),
-            (16, PANEL_Y + 6)
-        )
+        self.screen.blit(panel, (0, PANEL_Y))
 
         # --- Menus ---
         if self.state == "menu":
@@ -259,24 +280,23 @@ class Battle:
             for i, opt in enumerate(opts):
                 col = (255, 255, 0) if i == self.menu_cursor else (230, 230, 230)
                 x = int(W * 0.10) + int(W * 0.22) * i
-                self.screen.blit(font.render(opt, True, col), (x, PANEL_Y + 60))
+                self.screen.blit(render_text(opt, 36, col), (x, PANEL_Y + 60))
 
         elif self.state == "fight":
-            moves = self.player.moves if getattr(self.player, "moves", None) else [{"name": "Struggle", "power": 10}]
+            moves = self.player.moves or STRUGGLE
             for i, m in enumerate(moves[:4]):  # keep it clean if more than 4
                 col = (255, 255, 0) if i == self.move_cursor else (230, 230, 230)
                 x = int(W * 0.08) + int(W * 0.24) * i
-                self.screen.blit(font.render(m["name"], True, col), (x, PANEL_Y + 60))
+                self.screen.blit(render_text(m["name"], 36, col), (x, PANEL_Y + 60))
 
         elif self.state == "bag":
             items = [f"Potion x{self.inventory.potions}", f"Capture Ball x{self.inventory.capture_balls}"]
             for i, it in enumerate(items):
                 col = (255, 255, 0) if i == self.bag_cursor else (230, 230, 230)
                 x = int(W * 0.18) + int(W * 0.35) * i
-                self.screen.blit(font.render(it, True, col), (x, PANEL_Y + 60))
+                self.screen.blit(render_text(it, 36, col), (x, PANEL_Y + 60))
 
         elif self.state == "message":
-            big = pygame.font.SysFont(None, 42)
-            self.screen.blit(big.render(self.message, True, (255, 255, 255)), (int(W * 0.08), PANEL_Y + 60))
+            self.screen.blit(render_text(self.message, 42, (255, 255, 255)), (int(W * 0.08), PANEL_Y + 60))
 
 
@@ -0,0 +1,66 @@
+import math
+
+from game.config import TILE_SIZE
+
+# Swept AABB vs tile-grid collision.
+#
+# Boxes are (x, y, w, h) in world pixels with float x/y. Movement is resolved
+# one axis at a time; on each axis only the tile columns/rows the leading
+# edge crosses are tested, nearest first, so a large dt can never tunnel
+# through a wall and diagonal moves slide along it instead of stopping.
+
+
+def _span(lo, size, tile):
+    # tile indices covered by [lo, lo + size)
+    return math.floor(lo / tile), math.ceil((lo + size) / tile) - 1
+
+
+def sweep_x(x, y, w, h, dx, is_blocked, tile=TILE_SIZE):
+    """Move the box along x; returns (new_x, hit)."""
+    r0, r1 = _span(y, h, tile)
+    if dx > 0:
+        first = math.ceil((x + w) / tile)
+        last = math.ceil((x + w + dx) / tile) - 1
+        for c in range(first, last + 1):
+            for r in range(r0, r1 + 1):
+                if is_blocked(c, r):
+                    return c * tile - w, True
+    elif dx < 0:
+        first = math.floor(x / tile) - 1   # column left of the box
+        last = math.floor((x + dx) / tile)
+        for c in range(first, last - 1, -1):
+            for r in range(r0, r1 + 1):
+                if is_blocked(c, r):
+                    return (c + 1) * tile, True
+    return x + dx, False
+
+
+def sweep_y(x, y, w, h, dy, is_blocked, tile=TILE_SIZE):
+    """Move the box along y; returns (new_y, hit)."""
+    c0, c1 = _span(x, w, tile)
+    if dy > 0:
+        first = math.ceil((y + h) / tile)
+        last = math.ceil((y + h + dy) / tile) - 1
+        for r in range(first, last + 1):
+            for c in range(c0, c1 + 1):
+                if is_blocked(c, r):
+                    return r * tile - h, True
+    elif dy < 0:
+        first = math.floor(y / tile) - 1   # row above the box
+        last = math.floor((y + dy) / tile)
+        for r in range(first, last - 1, -1):
+            for c in range(c0, c1 + 1):
+                if is_blocked(c, r):
+                    return (r + 1) * tile, True
+    return y + dy, False
+
+
+def move_box(x, y, w, h, dx, dy, is_blocked, tile=TILE_SIZE):
+    """Move a box by (dx, dy): x first, then y.
+
+    is_blocked(tx, ty) must treat out-of-bounds cells as blocked.
+    Returns (x, y, hit_x, hit_y).
+    """
+    x, hit_x = sweep_x(x, y, w, h, dx, is_blocked, tile)
+    y, hit_y = sweep_y(x, y, w, h, dy, is_blocked, tile)
+    return x, y, hit_x, hit_y
@@ -6,7 +6,30 @@ SCREEN_SCALE = 4
 BASE_W, BASE_H = 200, 200
 SCREEN_W = BASE_W * SCREEN_SCALE
 SCREEN_H = BASE_H * SCREEN_SCALE
-FPS = 60
+FPS = 60                # render rate cap (0 = uncapped)
+
+# Simulation runs in fixed steps, independent of the render rate
+TICK_RATE = 60          # simulation steps per second
+MAX_CATCHUP_STEPS = 5   # max steps per frame before dropping time
+
+# When nothing animates and no timer runs, block on input instead of
+# spinning at FPS (timeout is a safety net, in ms)
+IDLE_WAIT_MS = 1000
+
+# Frame profiler (F3 overlay, F4 per-frame CSV dump)
+PROFILER_WINDOW = 300   # frames kept for the rolling percentiles
+PROFILER_CSV_PATH = "frame_profile.csv"
+
+# Draw the overworld at BASE_W x BASE_H with native tiles and upscale the
+# result to the window once per frame. HUD and menus stay at full resolution.
+RENDER_AT_BASE_RES = True
+
+# Max rendered text surfaces kept by game.fonts
+TEXT_CACHE_SIZE = 256
+
+# Map rendering: the map is pre-rendered in CHUNK_TILES x CHUNK_TILES chunks
+CHUNK_TILES = 8
+CHUNK_CACHE_SIZE = 16   # max chunk surfaces kept alive at once
 
 # Paths
 ASSETS_DIR = "assets"
@@ -14,11 +37,36 @@ MAPS_DIR = os.path.join(ASSETS_DIR, "maps")
 TILES_DIR = os.path.join(ASSETS_DIR, "tiles")
 OVERWORLD_DIR = os.path.join(ASSETS_DIR, "overworld")
 BATTLE_DIR = os.path.join(ASSETS_DIR, "battle")
+DATA_DIR = os.path.join(ASSETS_DIR, "data")
 
-
-MAP_PATH = os.path.join(MAPS_DIR, "route1.csv")
+SPECIES_PATH = os.path.join(DATA_DIR, "species.json")
 TILESET_PATH = os.path.join(TILES_DIR, "tileset.png")
 
+
+# Save game: a snapshot (written atomically in the background) plus a
+# journal of every change since, fsynced in batches
+SAVE_PATH = "save.pbsave"
+JOURNAL_FLUSH_SECONDS = 1.0        # max progress lost on a crash
+JOURNAL_COMPACT_BYTES = 64 * 1024  # fold the journal into a new snapshot past this
+
+# World graph: maps plus the edges/warps between them (see game.worldgraph)
+WORLD_PATH = os.path.join(MAPS_DIR, "world.json")
+MAP_CACHE_BYTES = 64 * 1024 * 1024     # visited maps kept resident within this budget
+MAP_PRELOAD_TILES = 6                  # preload a neighbour this close to its exit
+
+# Maps whose path is a region directory (tools.convert_map --regions) are
+# streamed region by region instead of loaded whole
+REGION_CACHE_BYTES = 32 * 1024 * 1024   # loaded regions kept within this budget
+REGION_PRELOAD_RADIUS = 1               # regions loaded around the player's region
+
+# NPC pathfinding (see game.pathfinding)
+PATH_CACHE_SIZE = 512             # cached paths per map
+PATH_REGION_TILES = 16            # a tile edit drops cached paths through its region
+PATH_EXPANSIONS_PER_TICK = 1024   # A* node budget per update (a few ms)
+
+# Map entities (see game.spatial): bucket size of the spatial hash
+SPATIAL_CELL_TILES = 8
+
 # Tile behavior
 BLOCKING_TILES = {5,6,12,13,14,20,21,24,26,27,28,32,34,35,36,37,39,42}
 ENCOUNTER_TILES = {15,22,23,38,51,52,53,58,59,60,61,62}
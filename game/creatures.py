@@ -1,22 +1,45 @@
 import pygame, os, random
 from game.config import BATTLE_DIR
+from game.assets import load_image
+from game.species import species_table
+
 
 class Creature:
-    def __init__(self, name, hp, atk, dfn, spd, sprite):
-        self.name = name
-        self.max_hp = hp
-        self.hp = hp
-        self.atk = atk
-        self.dfn = dfn
-        self.spd = spd
-        self.sprite = sprite
-        self.moves = []
+    # Compact instance: per-creature state only, everything else comes
+    # from the shared Species record
+    __slots__ = ("species", "hp", "sprite_variants")
+
+    def __init__(self, species, hp=None):
+        self.species = species
+        self.hp = species.hp if hp is None else hp
+        self.sprite_variants = {}   # (w, h) -> scaled copy of sprite
+
+    name = property(lambda self: self.species.name)
+    max_hp = property(lambda self: self.species.hp)
+    atk = property(lambda self: self.species.atk)
+    dfn = property(lambda self: self.species.dfn)
+    spd = property(lambda self: self.species.spd)
+    moves = property(lambda self: self.species.moves)
+
+    @property
+    def sprite(self):
+        return load_sprite(self.species.sprite)
+
+    def scaled_sprite(self, size):
+        spr = self.sprite_variants.get(size)
+        if spr is None:
+            spr = pygame.transform.scale(self.sprite, size)
+            self.sprite_variants[size] = spr
+        return spr
+
+    def clear_sprite_cache(self):
+        self.sprite_variants.clear()
 
 
 def load_sprite(fname):
     path = os.path.join(BATTLE_DIR, fname)
     try:
-        return pygame.image.load(path).convert_alpha()
+        return load_image(path)
     except:
         s = pygame.Surface((96,96), pygame.SRCALPHA)
         s.fill((200,50,50))
@@ -24,42 +47,8 @@ def load_sprite(fname):
 
 
 def create_player_creature():
-    m = Creature("Raccoon", 100, 18, 10, 12, load_sprite("raccoon_front.png"))
-    m.moves = [
-        {"name": "Quick Swipe", "power": 16},
-        {"name": "Heavy Pounce", "power": 25}
-    ]
-    return m
-
-
-def create_random_enemy():
-    python = Creature("Python", 120, 20, 14, 8, load_sprite("python_front.png"))
-    python.moves = [
-        {"name": "Constrict", "power": 20},
-        {"name": "Venom Bite", "power": 24}
-    ]
-
-    raven = Creature("Raven", 90, 16, 12, 25, load_sprite("raven_front.png"))
-    raven.moves = [
-        {"name": "Peck", "power": 15},
-        {"name": "Wing Slash", "power": 22}
-    ]
-
-    return random.choice([python, raven])
-
-
-def create_player_creature():
-    m=Creature("Raccoon",100,18,10,12,load_sprite("raccoon_front.png"))
-    m.moves=[{"name":"Swipe","power":18},{"name":"Pounce","power":25}]
-    return m
+    return Creature(species_table().starter)
 
-def create_random_enemy():
-    return random.choice([
-        Creature("Python",120,20,14,8,load_sprite("python_front.png")),
-        Creature("Raven",90,16,12,25,load_sprite("raven_front.png"))
-    ])
-def calculate_damage(attacker, defender, move):
-    base = move["power"]
-    dmg = base + attacker.atk - defender.dfn
-    return max(1, dmg + random.randint(-2, 2))
 
+def create_random_enemy(rng=random):
+    return Creature(species_table().pick_encounter(rng))
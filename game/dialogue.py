@@ -1,11 +1,10 @@
 import pygame
+from game.fonts import render_text
 
 class DialogueBox:
     def __init__(self):
         self.open = False
         self.text = ""
-        self.font = pygame.font.SysFont(None, 26)
-        self.big = pygame.font.SysFont(None, 30)
 
     def show(self, text):
         self.text = text
@@ -20,13 +19,18 @@ class DialogueBox:
                 if e.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_ESCAPE):
                     self.close()
 
+    def view_key(self):
+        # what draw() depends on; None when nothing is drawn
+        return (self.text,) if self.open else None
+
     def draw(self, screen, SW, SH):
         if not self.open:
-            return
+            return None
 
         box = pygame.Surface((SW, 120))
         box.fill((20,20,20))
         pygame.draw.rect(box,(255,255,255),(0,0,SW,120),3)
 
-        screen.blit(box, (0, SH - 120))
-        screen.blit(self.big.render(self.text, True, (255,255,255)), (30, SH - 95))
+        rect = screen.blit(box, (0, SH - 120))
+        screen.blit(render_text(self.text, 30, (255,255,255)), (30, SH - 95))
+        return rect
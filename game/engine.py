@@ -0,0 +1,184 @@
+import random
+
+# Display-free combat rules. play_turn() is the one place a turn is
+# resolved: Battle (the pygame UI) calls it once per player action and
+# simulate() calls it in a loop for balancing. Nothing in here may import
+# pygame or touch surfaces.
+
+STRUGGLE = ({"name": "Struggle", "power": 10},)
+
+CAPTURE_MIN = 0.05
+CAPTURE_MAX = 0.85
+
+MAX_TURNS = 200
+
+# play_turn() / simulate() outcomes
+WIN, LOSS, CAPTURED, TIMEOUT = "win", "loss", "captured", "timeout"
+
+# policy action meaning "throw a capture ball" (otherwise a move index)
+BALL = -1
+
+
+# ---------------------------------------------------------
+# Rules
+# ---------------------------------------------------------
+
+def roll_damage(power, atk, dfn, rng=random):
+    # power + atk - dfn with a uniform -2..+2 jitter, never below 1
+    dmg = power + atk - dfn + int(rng.random() * 5) - 2
+    return dmg if dmg > 1 else 1
+
+
+def calculate_damage(attacker, defender, move, rng=random):
+    return roll_damage(move["power"], attacker.atk, defender.dfn, rng)
+
+
+def capture_chance(hp, max_hp):
+    return max(CAPTURE_MIN, min(CAPTURE_MAX, 1 - hp / max_hp))
+
+
+def try_capture(hp, max_hp, rng=random):
+    return rng.random() < capture_chance(hp, max_hp)
+
+
+def pick_move(moves, rng=random):
+    moves = moves or STRUGGLE
+    return moves[int(rng.random() * len(moves))]
+
+
+# ---------------------------------------------------------
+# Policies: policy(powers, my_hp, foe_hp, foe_max_hp, balls, rng) -> action
+# where action is a move index or BALL
+# ---------------------------------------------------------
+
+def random_policy(powers, my_hp, foe_hp, foe_max_hp, balls, rng):
+    return int(rng.random() * len(powers))
+
+
+def strongest_policy(powers, my_hp, foe_hp, foe_max_hp, balls, rng):
+    return powers.index(max(powers))
+
+
+def capture_policy(threshold=0.5, fallback=random_policy):
+    """Throw balls once the foe is at or below threshold of max HP."""
+    def policy(powers, my_hp, foe_hp, foe_max_hp, balls, rng):
+        if balls > 0 and foe_hp <= foe_max_hp * threshold:
+            return BALL
+        return fallback(powers, my_hp, foe_hp, foe_max_hp, balls, rng)
+    return policy
+
+
+# ---------------------------------------------------------
+# Turns
+# ---------------------------------------------------------
+
+def move_powers(moves):
+    return tuple(m["power"] for m in (moves or STRUGGLE))
+
+
+def powers_of(c):
+    # Fighters carry theirs; anything else (a Creature) is read from its moves
+    return getattr(c, "powers", None) or move_powers(c.moves)
+
+
+class Bout:
+    """Both sides of a fight as plain numbers, which play_turn() updates in
+    place. simulate() fills one per battle so its turns allocate nothing;
+    Battle loads one from its creatures for each turn and stores it back.
+    """
+    __slots__ = ("hp", "max_hp", "atk", "dfn", "powers",
+                 "foe_hp", "foe_max_hp", "foe_atk", "foe_dfn", "foe_powers",
+                 "dealt", "taken")
+
+    def __init__(self, player, foe):
+        self.hp, self.max_hp, self.atk, self.dfn = player.hp, player.max_hp, player.atk, player.dfn
+        self.powers = powers_of(player)
+        self.foe_hp, self.foe_max_hp, self.foe_atk, self.foe_dfn = foe.hp, foe.max_hp, foe.atk, foe.dfn
+        self.foe_powers = powers_of(foe)
+        self.dealt = self.taken = 0   # HP the player removed / lost so far
+
+    def store(self, player, foe):
+        player.hp, foe.hp = self.hp, self.foe_hp
+
+
+def play_turn(bout, action, rng=random, foe_policy=random_policy):
+    """Resolve one turn: the player's action, then the foe's reply if it is
+    still in the fight. Lowers hp on both sides (never below 0) and adds to
+    bout.dealt / bout.taken.
+
+    action is a move index or BALL; the caller owns the ball count.
+    Returns WIN, CAPTURED, LOSS or None (fight goes on).
+    """
+    foe_hp = bout.foe_hp
+    if action == BALL:
+        if try_capture(foe_hp, bout.foe_max_hp, rng):
+            return CAPTURED
+    else:
+        dmg = roll_damage(bout.powers[action], bout.atk, bout.foe_dfn, rng)
+        if dmg >= foe_hp:
+            bout.dealt += foe_hp
+            bout.foe_hp = 0
+            return WIN
+        foe_hp -= dmg
+        bout.foe_hp = foe_hp
+        bout.dealt += dmg
+
+    hp, powers = bout.hp, bout.foe_powers
+    dmg = roll_damage(powers[foe_policy(powers, foe_hp, hp, bout.max_hp, 0, rng)],
+                      bout.foe_atk, bout.dfn, rng)
+    if dmg >= hp:
+        bout.taken += hp
+        bout.hp = 0
+        return LOSS
+    bout.hp = hp - dmg
+    bout.taken += dmg
+    return None
+
+
+# ---------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------
+
+class Fighter:
+    """Minimal creature stand-in for simulations (no sprite, no pygame)."""
+    __slots__ = ("name", "hp", "max_hp", "atk", "dfn", "spd", "moves", "powers")
+
+    def __init__(self, name, hp, atk, dfn, spd, moves, max_hp=None):
+        self.name = name
+        self.hp = hp
+        self.max_hp = hp if max_hp is None else max_hp
+        self.atk = atk
+        self.dfn = dfn
+        self.spd = spd
+        self.moves = moves
+        self.powers = move_powers(moves)
+
+    @classmethod
+    def from_species(cls, species):
+        return cls(species.name, species.hp, species.atk, species.dfn, species.spd, species.moves)
+
+
+def simulate(player, enemy, player_policy=random_policy, enemy_policy=random_policy,
+             rng=None, balls=0, max_turns=MAX_TURNS):
+    """Run one battle to completion, turn by turn through play_turn().
+
+    Creatures are not mutated.
+    Returns (outcome, turns, damage_dealt_by_player, damage_dealt_by_enemy).
+    """
+    if rng is None:
+        rng = random.Random()
+
+    bout = Bout(player, enemy)
+    powers = bout.powers
+
+    for turn in range(1, max_turns + 1):
+        action = player_policy(powers, bout.hp, bout.foe_hp, bout.foe_max_hp, balls, rng)
+        if action == BALL:
+            if balls <= 0:
+                raise ValueError("policy threw a capture ball with none left")
+            balls -= 1
+        outcome = play_turn(bout, action, rng, enemy_policy)
+        if outcome:
+            return outcome, turn, bout.dealt, bout.taken
+
+    return TIMEOUT, max_turns, bout.dealt, bout.taken
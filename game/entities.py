@@ -0,0 +1,44 @@
+from game.spatial import SpatialHash
+
+# Things placed on a map in world.json, next to its tiles:
+#
+#   "entities": [
+#     {"kind": "sign", "x": 7, "y": 3, "text": "Route 1"},
+#     {"kind": "npc", "x": 9, "y": 4, "sprite": "npc.png", "solid": true, "text": "Hi!"}
+#   ]
+#
+# `text` makes an entity interactable (E shows it), `sprite` is drawn from
+# assets/overworld, `solid` blocks movement. Positions live in the map's
+# SpatialHash, not on the entity.
+
+
+class Entity:
+    __slots__ = ("kind", "text", "sprite", "solid")
+
+    def __init__(self, kind, text="", sprite=None, solid=False):
+        self.kind = kind
+        self.text = text
+        self.sprite = sprite
+        self.solid = solid
+
+    def __repr__(self):
+        return f"Entity({self.kind!r})"
+
+
+def parse_entity(spec):
+    """(Entity, tx, ty) from one world.json entry."""
+    try:
+        tx, ty = int(spec["x"]), int(spec["y"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"entity needs integer x and y: {spec!r}")
+    entity = Entity(spec.get("kind", "sign"), spec.get("text", ""),
+                    spec.get("sprite"), bool(spec.get("solid", False)))
+    return entity, tx, ty
+
+
+def spawn_entities(specs):
+    """A fresh SpatialHash holding a map's entities."""
+    world = SpatialHash()
+    for spec in specs:
+        world.insert(*parse_entity(spec))
+    return world
@@ -0,0 +1,38 @@
+import pygame
+from collections import OrderedDict
+
+from game.config import TEXT_CACHE_SIZE
+
+# Shared font registry + LRU cache of rendered text surfaces.
+# Static labels are rendered once; only strings that actually change
+# (HP counts, popup text, ...) produce new surfaces.
+
+_fonts = {}                 # (size, bold) -> Font
+_text_cache = OrderedDict() # (size, bold, text, color) -> Surface
+
+
+def get_font(size, bold=False):
+    key = (size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(None, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def render_text(text, size, color, bold=False):
+    key = (size, bold, text, tuple(color))
+    surf = _text_cache.get(key)
+    if surf is not None:
+        _text_cache.move_to_end(key)
+        return surf
+
+    surf = get_font(size, bold).render(text, True, color)
+    _text_cache[key] = surf
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surf
+
+
+def clear_text_cache():
+    _text_cache.clear()
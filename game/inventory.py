@@ -1,12 +1,35 @@
 class Inventory:
     def __init__(self):
-        self.potions = 0
-        self.capture_balls = 0
+        self.on_change = None   # called with the inventory after every change
+        self._potions = 0
+        self._capture_balls = 0
 
         # Party system
         self.party = []
         self.active = None
 
+    def changed(self):
+        if self.on_change:
+            self.on_change(self)
+
+    @property
+    def potions(self):
+        return self._potions
+
+    @potions.setter
+    def potions(self, n):
+        self._potions = n
+        self.changed()
+
+    @property
+    def capture_balls(self):
+        return self._capture_balls
+
+    @capture_balls.setter
+    def capture_balls(self, n):
+        self._capture_balls = n
+        self.changed()
+
     # ------------------ Items ------------------
 
     def heal(self, creature, amount=40):
@@ -18,7 +41,7 @@ class Inventory:
             return False
 
         creature.hp = min(creature.max_hp, creature.hp + amount)
-        self.potions -= 1
+        self.potions -= 1   # reports the heal too
         return True
 
     # ------------------ Party ------------------
@@ -27,10 +50,12 @@ class Inventory:
         self.party.append(creature)
         if self.active is None:
             self.active = creature
+        self.changed()
 
     def set_active(self, creature):
         if creature in self.party and creature.hp > 0:
             self.active = creature
+            self.changed()
             return True
         return False
 
@@ -44,10 +69,12 @@ class Inventory:
             return False
 
         self.party.remove(creature)
+        creature.clear_sprite_cache()
 
         if creature is self.active:
             self.active = living[0] if living else None
 
+        self.changed()
         return True
 
     # ------------------ Battle Helpers ------------------
@@ -0,0 +1,196 @@
+import glob
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from game.config import JOURNAL_FLUSH_SECONDS
+from game.save import pack_str, Reader
+
+# Append-only journal of game-state changes since the last save snapshot.
+#
+# Files sit next to the save: <save>.<generation>.jnl. Taking a snapshot
+# (Overworld.save_game) starts a new generation; once the snapshot is on
+# disk, older journals are deleted. Loading = snapshot + every journal from
+# its generation up, folded over it in order.
+#
+# Records hold absolute values (new tile ID, item counts, whole party), so
+# replaying one twice is harmless. Each record is framed as
+#   length u16, crc32 u32, payload
+# and reading stops at the first torn or corrupt record: a crash mid-write
+# loses only that batch.
+#
+# append() only buffers; a worker thread writes the buffer once per
+# JOURNAL_FLUSH_SECONDS with a single fsync, so the cost is proportional to
+# what changed and a crash loses at most about that long.
+
+TILE = b"T"        # map, x, y, tile
+ITEMS = b"I"       # potions, capture balls
+PARTY = b"P"       # active index, [(species, hp)]
+LOCATION = b"L"    # map, x, y, facing
+
+FRAME = struct.Struct("<HI")
+
+
+def tile_record(map_name, tx, ty, tid):
+    return TILE + pack_str(map_name) + struct.pack("<IIH", tx, ty, tid)
+
+
+def items_record(potions, capture_balls):
+    return ITEMS + struct.pack("<HH", potions, capture_balls)
+
+
+def party_record(active, party):
+    out = PARTY + struct.pack("<hH", active, len(party))
+    return out + b"".join(pack_str(name) + struct.pack("<h", hp) for name, hp in party)
+
+
+def location_record(map_name, x, y, facing):
+    return LOCATION + pack_str(map_name) + struct.pack("<dd", x, y) + pack_str(facing)
+
+
+def frame(payload):
+    return FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+# ---------------------------------------------------------
+# Reading
+# ---------------------------------------------------------
+
+def journal_path(save_path, generation):
+    return f"{save_path}.{generation}.jnl"
+
+
+def journal_generations(save_path):
+    gens = []
+    for p in glob.glob(glob.escape(save_path) + ".*.jnl"):
+        g = p[len(save_path) + 1:-len(".jnl")]
+        if g.isdigit():
+            gens.append(int(g))
+    return sorted(gens)
+
+
+def read_records(path):
+    with open(path, "rb") as f:
+        buf = f.read()
+    pos = 0
+    while pos + FRAME.size <= len(buf):
+        n, crc = FRAME.unpack_from(buf, pos)
+        payload = buf[pos + FRAME.size:pos + FRAME.size + n]
+        if len(payload) < n or zlib.crc32(payload) != crc:
+            break   # torn tail from a crash
+        yield payload
+        pos += FRAME.size + n
+
+
+def apply_record(data, payload):
+    """Fold one record into a SaveData."""
+    r = Reader(payload)
+    kind = r.unpack("<c")[0]
+    if kind == TILE:
+        name = r.str()
+        tx, ty, tid = r.unpack("<IIH")
+        data.edits.setdefault(name, {})[(tx, ty)] = tid
+    elif kind == ITEMS:
+        data.potions, data.capture_balls = r.unpack("<HH")
+    elif kind == PARTY:
+        data.active, count = r.unpack("<hH")
+        data.party = [(r.str(), r.unpack("<h")[0]) for _ in range(count)]
+    elif kind == LOCATION:
+        data.map_name = r.str()
+        data.x, data.y = r.unpack("<dd")
+        data.facing = r.str()
+
+
+def replay_journals(save_path, data):
+    """Apply every journal from data.generation up; returns the last generation."""
+    last = data.generation
+    for g in journal_generations(save_path):
+        if g >= data.generation:
+            for payload in read_records(journal_path(save_path, g)):
+                apply_record(data, payload)
+            last = g
+    return last
+
+
+def remove_journals(save_path, below):
+    for g in journal_generations(save_path):
+        if g < below:
+            try:
+                os.remove(journal_path(save_path, g))
+            except OSError:
+                pass
+
+
+# ---------------------------------------------------------
+# Writing
+# ---------------------------------------------------------
+
+class Journal:
+    def __init__(self, save_path, generation=0, interval=JOURNAL_FLUSH_SECONDS):
+        self.save_path = save_path
+        self.generation = generation
+        self.interval = interval
+        self.buf = bytearray()
+        self.size = 0            # bytes in the current generation (written + buffered)
+        self.last_flush = time.monotonic()
+
+        self.writes = queue.Queue()   # (path, bytes) in order; None stops the worker
+        self.errors = queue.Queue()
+        self.thread = threading.Thread(target=self._worker, name="journal-writer", daemon=True)
+        self.thread.start()
+
+    def append(self, payload):
+        rec = frame(payload)
+        self.buf += rec
+        self.size += len(rec)
+
+    def due(self):
+        return time.monotonic() - self.last_flush >= self.interval
+
+    def flush(self):
+        if self.buf:
+            self.writes.put((journal_path(self.save_path, self.generation), bytes(self.buf)))
+            self.buf.clear()
+        self.last_flush = time.monotonic()
+
+    def rotate(self):
+        """Start the next generation (a snapshot is about to be taken)."""
+        self.flush()
+        self.generation += 1
+        self.size = 0
+        return self.generation
+
+    def _worker(self):
+        f = None
+        while True:
+            item = self.writes.get()
+            if item is None:
+                break
+            path, data = item
+            try:
+                if f is None or f.name != path:
+                    if f:
+                        f.close()
+                    f = open(path, "ab")
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())   # one fsync per batch
+            except Exception as e:
+                self.errors.put(e)
+        if f:
+            f.close()
+
+    def close(self):
+        """Write out everything buffered and stop the writer."""
+        self.flush()
+        self.writes.put(None)
+        self.thread.join()
+
+    def check(self):
+        try:
+            raise self.errors.get_nowait()
+        except queue.Empty:
+            pass
@@ -0,0 +1,50 @@
+import queue
+import threading
+
+
+class BackgroundLoader:
+    """One worker thread running load(key) for requested keys.
+
+    request() queues a key once; poll() is called from the main thread and
+    returns the (key, result) pairs finished so far. A load that raised is
+    re-raised from poll(), on the main thread.
+    """
+
+    def __init__(self, load, name="loader"):
+        self.load = load
+        self.pending = set()
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self.thread.start()
+
+    def _worker(self):
+        while True:
+            key = self.requests.get()
+            if key is None:
+                return
+            try:
+                self.results.put((key, self.load(key), None))
+            except Exception as e:
+                self.results.put((key, None, e))
+
+    def request(self, key):
+        if key not in self.pending:
+            self.pending.add(key)
+            self.requests.put(key)
+
+    def poll(self, wait=False):
+        """Finished loads; with wait=True, blocks until nothing is pending."""
+        done = []
+        while True:
+            try:
+                key, result, error = self.results.get(block=wait and bool(self.pending))
+            except queue.Empty:
+                return done
+            self.pending.discard(key)
+            if error is not None:
+                raise error
+            done.append((key, result))
+
+    def close(self):
+        self.requests.put(None)
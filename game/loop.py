@@ -0,0 +1,67 @@
+import pygame
+
+from game.config import TICK_RATE, MAX_CATCHUP_STEPS
+
+
+class FixedStep:
+    """Accumulator that turns variable frame times into fixed simulation steps.
+
+    Each frame: steps = advance(frame_dt), run update(step) that many times,
+    then draw with alpha (0..1, fraction of the next step already elapsed).
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, max_steps=MAX_CATCHUP_STEPS):
+        self.step = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.acc = 0.0
+
+    def advance(self, frame_dt):
+        self.acc += frame_dt
+        steps = int(self.acc / self.step)
+        if steps > self.max_steps:
+            # Too far behind (debugger, window drag, slow kiosk): drop the
+            # backlog instead of spiralling
+            steps = self.max_steps
+            self.acc = self.acc % self.step
+        else:
+            self.acc -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        return min(1.0, self.acc / self.step)
+
+    def reset(self):
+        self.acc = 0.0
+
+
+def wait_for_events(timeout_ms):
+    """Block until at least one event arrives (or timeout); returns them all."""
+    first = pygame.event.wait(timeout_ms)
+    if first.type == pygame.NOEVENT:
+        return []
+    return [first] + pygame.event.get()
+
+
+class KeyState:
+    """Held keys, tracked from KEYDOWN/KEYUP events.
+
+    Drop-in for pygame.key.get_pressed() (keys[pygame.K_a] -> bool). Because
+    it depends only on the event stream, a recorded session replays the same
+    movement without a real keyboard.
+    """
+
+    def __init__(self):
+        self.held = set()
+
+    def feed(self, events):
+        for e in events:
+            if e.type == pygame.KEYDOWN:
+                self.held.add(e.key)
+            elif e.type == pygame.KEYUP:
+                self.held.discard(e.key)
+            elif e.type == pygame.WINDOWFOCUSLOST:
+                self.held.clear()   # key-ups go to the other window
+
+    def __getitem__(self, key):
+        return key in self.held
@@ -1,32 +1,95 @@
+import argparse
+import os
+import random
+
 import pygame
-from game.config import SCREEN_W, SCREEN_H, FPS
+from game.config import SCREEN_W, SCREEN_H, FPS, IDLE_WAIT_MS, SAVE_PATH
 from game.overworld import Overworld
+from game.loop import FixedStep, KeyState, wait_for_events
+from game.profiler import profiler
+from game.replay import Recorder
+
+
+def run_frame(screen, overworld, stepper, keys, events, frame_dt):
+    """One frame: events, fixed-rate updates, draw, present.
+
+    Shared by the live loop and tools.replay. Returns False on quit.
+    """
+    running = True
+    profiler.begin("events")
+    keys.feed(events)
+    for e in events:
+        if e.type == pygame.QUIT:
+            running = False
+        elif e.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            overworld.invalidate()
+
+    overworld.handle_events(events)
+    profiler.end("events")
+
+    # Fixed-rate simulation, interpolated rendering
+    for _ in range(stepper.advance(frame_dt)):
+        overworld.update(stepper.step, keys)
+    if profiler.visible:
+        overworld.invalidate()   # overlay sits on top of everything
+    dirty = overworld.draw(stepper.alpha)
+    profiler.draw(screen)
+
+    # Present only what changed; a fully static frame is skipped
+    profiler.begin("present")
+    if dirty:
+        pygame.display.update(dirty)
+    profiler.end("present")
+    profiler.end_frame()
+    return running
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Pocket Battle RPG")
+    parser.add_argument("--seed", type=int, help="RNG seed (random if omitted)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the session for tools.replay (fresh game, saving off)")
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else int.from_bytes(os.urandom(4), "little")
+    random.seed(seed)
+
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
     pygame.display.set_caption("Pocket Battle RPG")
     clock = pygame.time.Clock()
+    stepper = FixedStep()
+    keys = KeyState()
+    recorder = Recorder(args.record, seed) if args.record else None
 
-    overworld = Overworld(screen)
+    # a recording must start from a known state, so it ignores the save file
+    # and loads streamed regions and neighbouring maps synchronously
+    overworld = Overworld(screen, save_path=None if args.record else SAVE_PATH,
+                          sync_loads=bool(args.record))
 
     running = True
+    idle = False
     while running:
-        dt = clock.tick(FPS) / 1000
-
-        events = pygame.event.get()
-
-        for e in events:
-            if e.type == pygame.QUIT:
-                running = False
-
-        overworld.handle_events(events)
-
-        overworld.update(dt)
-        overworld.draw()
+        if idle:
+            # Nothing animates and no timer runs: sleep until input arrives,
+            # then restart timing so the wait does not count as game time
+            events = wait_for_events(IDLE_WAIT_MS)
+            clock.tick()
+            stepper.reset()
+            frame_dt = 0.0
+        else:
+            frame_dt = clock.tick(FPS) / 1000
+            events = pygame.event.get()
 
-        pygame.display.flip()
+        if recorder:
+            recorder.frame(frame_dt, events)
+        running = run_frame(screen, overworld, stepper, keys, events, frame_dt)
+        idle = overworld.is_idle(keys)
 
+    overworld.shutdown()
+    if recorder:
+        recorder.close()
+    profiler.stop_csv()
     pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+import array
+import csv
+import mmap
+import os
+import struct
+import sys
+
+# Binary map format (.pbmap), little-endian:
+#
+#   magic    4s   b"PBMP"
+#   version  u16
+#   layers   u16
+#   width    u32
+#   height   u32
+#   cells    u16 * layers * height * width   (layer-major, then row-major)
+#
+# read_map() memory-maps the file copy-on-write and hands out memoryview
+# rows straight into the mapping: nothing is parsed or copied at load time,
+# and writes (set_tile) stay private to the process.
+
+MAGIC = b"PBMP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+MAX_TILE_ID = 0xFFFF
+
+
+class MapData:
+    """A loaded map: layer(i) -> list of rows, each indexable as row[x]."""
+
+    def __init__(self, width, height, cells):
+        self.width = width
+        self.height = height
+        self.cells = cells   # flat uint16 buffer, all layers
+        self.layers = len(cells) // (width * height) if width and height else 0
+
+    def layer(self, i=0):
+        base = i * self.width * self.height
+        w = self.width
+        return [self.cells[base + y * w: base + (y + 1) * w] for y in range(self.height)]
+
+
+def read_map(path):
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    if len(mm) < HEADER.size:
+        raise ValueError(f"{path}: truncated map header")
+
+    magic, version, layers, w, h = HEADER.unpack_from(mm)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a .pbmap file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported map version {version}")
+    size = HEADER.size + layers * w * h * 2
+    if len(mm) < size:
+        raise ValueError(f"{path}: expected {size} bytes, got {len(mm)}")
+
+    cells = memoryview(mm)[HEADER.size:size]
+    if sys.byteorder == "little":
+        cells = cells.cast("H")
+    else:
+        data = array.array("H", cells)   # big-endian host: one swapped copy
+        data.byteswap()
+        cells = memoryview(data)
+    return MapData(w, h, cells)
+
+
+def write_map(path, layers):
+    """Write one or more equally sized grids (lists of rows) to path."""
+    h = len(layers[0])
+    w = len(layers[0][0]) if h else 0
+    data = array.array("H")
+    for grid in layers:
+        if len(grid) != h or any(len(row) != w for row in grid):
+            raise ValueError("all map layers must be the same size")
+        for row in grid:
+            data.extend(row)
+    if sys.byteorder != "little":
+        data.byteswap()
+
+    # write next to the target and swap in, so a crash never leaves half a map
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(layers), w, h))
+        f.write(data.tobytes())
+    os.replace(tmp, path)
+
+
+def read_csv_map(path):
+    with open(path, newline="") as f:
+        return [[int(x) for x in row] for row in csv.reader(f) if row]
+
+
+def write_csv_map(path, grid):
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows(grid)
+
+
+def load_grid(path, layer=0):
+    """Rows of one layer from a .pbmap (zero-copy) or a legacy .csv map."""
+    if path.endswith(".csv"):
+        return read_csv_map(path)
+    return read_map(path).layer(layer)
+
+
+def grid_bytes(grid):
+    """Packed uint16 cells of a grid (lists or memoryview rows alike)."""
+    out = bytearray()
+    for row in grid:
+        out += row.tobytes() if isinstance(row, memoryview) else array.array("H", row).tobytes()
+    return bytes(out)
@@ -1,34 +1,81 @@
+import os
 import pygame
-import csv
 import random
 
 from game.config import (
     TILE_SIZE, SCREEN_SCALE, SCREEN_W, SCREEN_H,
-    MAP_PATH, TILESET_PATH, SIGN_TILE,
-    BLOCKING_TILES, ENCOUNTER_TILES,
+    BASE_W, BASE_H, RENDER_AT_BASE_RES,
+    WORLD_PATH, MAP_PRELOAD_TILES, TILESET_PATH, OVERWORLD_DIR,
+    SAVE_PATH, JOURNAL_COMPACT_BYTES,
     CAPTURE_BALL_TILE, POTION_TILE, BASE_GRASS_TILE
 )
 
 from game.player import OverworldPlayer, load_player_sprites
-from game.creatures import create_player_creature, create_random_enemy
+from game.creatures import Creature, create_player_creature, create_random_enemy
 from game.battle import Battle
 from game.inventory import Inventory
 from game.pause import PauseMenu
 from game.party import PartyMenu
 from game.dialogue import DialogueBox
+from game.fonts import render_text
+from game.assets import load_image, preload_images
+from game.species import load_species_table, species_table
+from game.profiler import profiler
+from game.tileflags import build_tile_flags, FlagGrid, BLOCKING, ENCOUNTER, SIGN, PICKUP
+from game.tilemap import ChunkCache
+from game.streaming import StreamingWorld
+from game.spatial import SpatialHash
+from game.worldgraph import load_world_graph, MapCache
+from game.save import SaveWriter, snapshot, read_save, party_state
+from game.pathfinding import PathService
+from game.journal import (
+    Journal, replay_journals, remove_journals, journal_generations,
+    tile_record, items_record, party_record, location_record,
+)
 
 
 class Overworld:
-    def __init__(self, screen):
+    def __init__(self, screen, save_path=SAVE_PATH, sync_loads=False):
         self.screen = screen
-
-        # Map
-        self.world = self.load_map()
+        # Recording/replay: load streamed regions and preloaded maps right
+        # away instead of letting thread timing decide which cells are
+        # walkable and when the game may idle
+        self.sync_loads = sync_loads
+
+        # World view: either the window itself, or a BASE_W x BASE_H surface
+        # that gets upscaled to the window in one pass
+        if RENDER_AT_BASE_RES:
+            self.render_scale = 1
+            self.view = pygame.Surface((BASE_W, BASE_H)).convert()
+        else:
+            self.render_scale = SCREEN_SCALE
+            self.view = screen
+        self.view_w, self.view_h = self.view.get_size()
+
+        # Decode battle/overworld/tile images once, up front, so encounters
+        # never hit the disk
+        preload_images()
+
+        # Species table is loaded and validated once at startup
+        load_species_table()
+
+        # Maps: a graph of maps joined by edges and warps; visited and
+        # nearby ones stay resident in the cache
         self.tiles = self.load_tiles()
+        self.tile_flags = build_tile_flags(len(self.tiles))
+        self.graph = load_world_graph(WORLD_PATH)
+        self.maps = MapCache(self.graph, self.tiles, self.tile_flags, TILE_SIZE * self.render_scale,
+                             sync=sync_loads)
+        self.map_name, start_x, start_y = self.graph.start
+        m = self.maps.get(self.map_name)
+        self.world, self.flags, self.chunks = m.grid, m.flags, m.chunks
+        self.entities = m.entities   # SpatialHash of NPCs, signs... on this map
+        self.entity_images = {}      # sprite name -> scaled surface
+        self.paths = m.paths         # NPC pathfinding (None on streamed maps)
 
         # Player
         self.frames = load_player_sprites()
-        self.player = OverworldPlayer(5 * TILE_SIZE, 10 * TILE_SIZE, self.frames)
+        self.player = OverworldPlayer(start_x * TILE_SIZE, start_y * TILE_SIZE, self.frames)
 
         # Inventory + Party
         self.inventory = Inventory()
@@ -44,6 +91,14 @@ class Overworld:
         # Camera
         self.camx = 0
         self.camy = 0
+        self.player_draw_pos = self.player.rect.topleft
+
+        # Dirty-rect bookkeeping (see draw)
+        self.drawn_base_key = None
+        self.drawn_overlay_key = None
+        self.overlay_rects = []
+        self.backdrop = None
+        self.world_version = 0   # bumped on every tile change
 
         # State
         self.mode = "world"   # "world" or "battle"
@@ -60,15 +115,37 @@ class Overworld:
         self.last_tile = None
         self.encounter_cd = 0.0
 
+        # Warp the player arrived on; it only fires again once they step off
+        self.arrival_tile = None
+
+        # Save game: snapshot + journal of changes since. None disables
+        # loading and saving (replays, benchmarks)
+        self.save_path = save_path
+        self.saver = None
+        self.journal = None
+        if save_path:
+            self.saver = SaveWriter(save_path, self.graph,
+                                    on_saved=lambda d: remove_journals(save_path, d.generation))
+            try:
+                generation, broken = self.load_game(), False
+            except (OSError, ValueError) as e:
+                print(f"Ignoring save {save_path}: {e}")
+                generation, broken = max(journal_generations(save_path), default=-1) + 1, True
+            self.journal = Journal(save_path, generation)
+            self.journaled_location = self.location()
+            self.journaled_party = party_state(self.inventory)
+            self.inventory.on_change = self.journal_inventory
+            if broken:
+                self.save_game()   # replace the unreadable save right away
+
+        # Streamed maps: have the start area in before the first frame
+        self.stream_regions(wait=True)
+
     # -----------------------------------------------------
     # Loading
     # -----------------------------------------------------
-    def load_map(self):
-        with open(MAP_PATH) as f:
-            return [[int(x) for x in row] for row in csv.reader(f)]
-
     def load_tiles(self):
-        sheet = pygame.image.load(TILESET_PATH).convert_alpha()
+        sheet = load_image(TILESET_PATH)
         tiles = []
         cols = sheet.get_width() // TILE_SIZE
         rows = sheet.get_height() // TILE_SIZE
@@ -76,11 +153,209 @@ class Overworld:
             for x in range(cols):
                 r = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
                 tile = sheet.subsurface(r).copy()
-                tile = pygame.transform.scale(tile, (TILE_SIZE * SCREEN_SCALE, TILE_SIZE * SCREEN_SCALE))
+                if self.render_scale != 1:
+                    size = TILE_SIZE * self.render_scale
+                    tile = pygame.transform.scale(tile, (size, size))
                 tiles.append(tile)
 
         return tiles
 
+    def set_world(self, world, flags=None, chunks=None, entities=None, paths=None):
+        # Swap in a different tile grid; flags and chunks are built for it
+        # unless passed in (the map cache keeps them per map)
+        self.world = world
+        self.entities = entities if entities is not None else SpatialHash()
+        self.flags = flags if flags is not None else FlagGrid(world, self.tile_flags)
+        self.chunks = chunks if chunks is not None else ChunkCache(world, self.tiles, TILE_SIZE * self.render_scale)
+        if paths is None and not isinstance(world, StreamingWorld):
+            paths = PathService(self.flags)   # labelled within update()'s budget
+            paths.watch(self.entities)
+        self.paths = paths
+        self.map_name = None
+        self.world_version += 1
+        self.last_tile = None
+        self.invalidate()
+
+    def enter_map(self, name, px, py):
+        # Switch maps with the player at world pixel (px, py)
+        m = self.maps.get(name)
+        self.set_world(m.grid, m.flags, m.chunks, m.entities, m.paths)
+        self.map_name = name
+        self.player.teleport(px, py)
+        self.arrival_tile = self.get_player_tile()
+        self.stream_regions(wait=True)
+
+    @property
+    def map_info(self):
+        return self.graph.maps.get(self.map_name)
+
+    def exit_side(self, tx, ty):
+        # Edge of the current map that (tx, ty) lies beyond, if it leads somewhere
+        info = self.map_info
+        if info is None:
+            return None
+        if tx < 0:
+            side = "west"
+        elif tx >= len(self.world[0]):
+            side = "east"
+        elif ty < 0:
+            side = "north"
+        elif ty >= len(self.world):
+            side = "south"
+        else:
+            return None
+        return side if side in info.edges else None
+
+    def is_blocked(self, tx, ty):
+        # off-map cells are walls, except past an edge into another map
+        f = self.flags.at(tx, ty)
+        if f is None:
+            return self.exit_side(tx, ty) is None
+        return f & BLOCKING != 0 or any(e.solid for e in self.entities.at(tx, ty))
+
+    def interaction_at(self, tx, ty):
+        # Text shown for E on (tx, ty): an entity's, else a sign tile's
+        for e in self.entities.at(tx, ty):
+            if e.text:
+                return e.text
+        if (self.flags.at(tx, ty) or 0) & SIGN:
+            return "The sign reads: Welcome to Route 1!"
+        return None
+
+    def take_edge(self, tx, ty):
+        side = self.exit_side(tx, ty)
+        if side is None:
+            return
+        name, offset = self.map_info.edges[side]
+        target = self.maps.get(name)
+        x, y = self.player.x, self.player.y
+        shift = offset * TILE_SIZE
+        # keep the sub-tile position so walking across looks continuous
+        if side == "east":
+            x, y = x - len(self.world[0]) * TILE_SIZE, y + shift
+        elif side == "west":
+            x, y = x + len(target.grid[0]) * TILE_SIZE, y + shift
+        elif side == "south":
+            x, y = x + shift, y - len(self.world) * TILE_SIZE
+        else:
+            x, y = x + shift, y + len(target.grid) * TILE_SIZE
+        self.enter_map(name, x, y)
+
+    def preload_exits(self, tx, ty):
+        # Start loading neighbours in the background when an exit is close
+        info = self.map_info
+        if info is not None:
+            d = MAP_PRELOAD_TILES
+            near = {
+                "west": tx < d, "east": tx >= len(self.world[0]) - d,
+                "north": ty < d, "south": ty >= len(self.world) - d,
+            }
+            for side, (name, _) in info.edges.items():
+                if near[side]:
+                    self.maps.preload(name)
+            for (wx, wy), warp in info.warps.items():
+                if abs(wx - tx) + abs(wy - ty) <= d:
+                    self.maps.preload(warp.map)
+        self.maps.poll()
+
+    # -----------------------------------------------------
+    # Save / load
+    # -----------------------------------------------------
+    def save_game(self):
+        # Snapshot here, encode + write on the saver's thread. The journal
+        # moves to a new generation; older ones go once the snapshot is down.
+        # Returns False when an earlier background write had failed.
+        if not self.saver:
+            return False
+        ok = self.check_saves()
+        self.saver.save(snapshot(self, self.journal.rotate()))
+        return ok
+
+    def check_saves(self):
+        # Background write errors surface here: report them and keep
+        # playing (the next save or journal flush tries again)
+        ok = True
+        for writer in (self.saver, self.journal):
+            try:
+                writer.check()
+            except (OSError, ValueError) as e:
+                print(f"Save failed: {e}")
+                self.show_popup(f"Save failed: {e}", 4.0)
+                ok = False
+        return ok
+
+    def load_game(self):
+        # Snapshot (if any) plus the journals written after it. Returns the
+        # journal generation to carry on appending to.
+        if os.path.exists(self.save_path):
+            data = read_save(self.save_path)
+        else:
+            data = snapshot(self)   # no snapshot yet: journals on a fresh game
+        remove_journals(self.save_path, data.generation)   # late writes to old ones
+        generation = replay_journals(self.save_path, data)
+
+        table = species_table()
+        for name, _ in data.party:
+            if name not in table.by_name:
+                raise ValueError(f"unknown species {name!r}")
+        if data.map_name not in self.graph.maps:
+            raise ValueError(f"unknown map {data.map_name!r}")
+
+        inv = self.inventory
+        inv.potions = data.potions
+        inv.capture_balls = data.capture_balls
+        inv.party = [Creature(table[name], hp) for name, hp in data.party]
+        inv.active = inv.party[data.active] if 0 <= data.active < len(inv.party) else None
+
+        self.maps.reset(data.edits)
+        self.enter_map(data.map_name, data.x, data.y)
+        self.player.dir = data.facing
+        return generation
+
+    def location(self):
+        return self.map_name, self.player.x, self.player.y, self.player.dir
+
+    def journal_inventory(self, inv):
+        self.journal.append(items_record(inv.potions, inv.capture_balls))
+        self.journaled_party = party_state(inv)
+        self.journal.append(party_record(*self.journaled_party))
+
+    def journal_tick(self):
+        # Position and battle damage change every frame: sample them once
+        # per flush instead of journaling each change
+        j = self.journal
+        if j is None:
+            return
+        if j.due():
+            loc = self.location()
+            if loc != self.journaled_location:
+                if self.map_name:
+                    j.append(location_record(*loc))
+                self.journaled_location = loc
+            party = party_state(self.inventory)
+            if party != self.journaled_party:
+                j.append(party_record(*party))
+                self.journaled_party = party
+            j.flush()
+            self.check_saves()
+        if j.size >= JOURNAL_COMPACT_BYTES:
+            self.save_game()
+
+    def journal_pending(self):
+        # progress journal_tick has not written out yet
+        j = self.journal
+        return j is not None and bool(
+            j.buf or self.location() != self.journaled_location
+            or party_state(self.inventory) != self.journaled_party)
+
+    def shutdown(self):
+        # final snapshot, and wait for it so quitting never loses progress
+        if self.saver:
+            self.save_game()
+            self.saver.wait()
+            self.journal.close()
+            self.check_saves()
+
     # -----------------------------------------------------
     # Helpers
     # -----------------------------------------------------
@@ -89,10 +364,31 @@ class Overworld:
         self.popup_timer = float(duration)
 
     def get_tile_at(self, tx, ty):
+        # None off the map, and (streamed maps) where the region is not in yet
         if ty < 0 or tx < 0 or ty >= len(self.world) or tx >= len(self.world[0]):
             return None
         return self.world[ty][tx]
 
+    def set_tile(self, tx, ty, tid):
+        self.world[ty][tx] = tid
+        if self.map_name:
+            self.maps.record_edit(self.map_name, tx, ty, tid)
+            if self.journal:
+                self.journal.append(tile_record(self.map_name, tx, ty, tid))
+        self.flags.set_tile(tx, ty, tid)
+        if self.paths:
+            self.paths.tile_changed(tx, ty)
+        self.chunks.invalidate_tile(tx, ty)
+        self.world_version += 1
+
+    def stream_regions(self, wait=False):
+        if not isinstance(self.world, StreamingWorld):
+            return
+        wait = wait or self.sync_loads
+        for x0, y0, x1, y1 in self.world.update(*self.get_player_tile(), wait=wait):
+            self.chunks.invalidate_area(x0, y0, x1, y1)
+            self.world_version += 1
+
     def get_player_tile(self):
         tx = self.player.rect.centerx // TILE_SIZE
         ty = self.player.rect.centery // TILE_SIZE
@@ -115,10 +411,45 @@ class Overworld:
     def movement_locked(self):
         return self.pause.open or self.party_menu.open or self.dialogue.open
 
+    def is_idle(self, keys):
+        """True when nothing can change until the next input event."""
+        if self.popup_timer > 0 or self.encounter_cd > 0:
+            return False
+        # background loads are only installed by update()
+        if self.maps.loader.pending:
+            return False
+        if isinstance(self.world, StreamingWorld) and self.world.loader.pending:
+            return False
+        # keep updating until the journal has caught up, or a crash while
+        # idle would lose everything since the last flush
+        if self.journal_pending():
+            return False
+        if self.party_menu.open and self.party_menu.key_cd > 0:
+            return False
+
+        if self.mode == "battle" and self.battle:
+            return self.battle.key_cd <= 0 and self.battle.state != "end"
+
+        if self.movement_locked():
+            return True
+
+        # Free roaming: idle while standing still with no direction held
+        vx, vy, _ = self.player.read_input(keys)
+        return not (vx or vy) and self.player.is_still()
+
     # -----------------------------------------------------
     # Events
     # -----------------------------------------------------
     def handle_events(self, events):
+        # Profiler controls work everywhere
+        for e in events:
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_F3:
+                profiler.toggle_overlay()
+                self.invalidate()
+            elif e.type == pygame.KEYDOWN and e.key == pygame.K_F4:
+                profiler.toggle_csv()
+                self.invalidate()
+
         # Dialogue eats all input first
         if self.dialogue.open:
             self.dialogue.handle(events)
@@ -138,6 +469,12 @@ class Overworld:
                 self.pause.open = False
                 self.party_menu.open = True
                 self.party_menu.from_battle = False
+            elif action == "save":
+                self.pause.open = False
+                if not self.saver:
+                    self.show_popup("Saving is off")
+                elif self.save_game():
+                    self.show_popup("Game saved")
             return
 
         # Party menu input
@@ -149,10 +486,9 @@ class Overworld:
         if self.mode == "world":
             for e in events:
                 if e.type == pygame.KEYDOWN and e.key == pygame.K_e:
-                    fx, fy = self.get_front_tile()
-                    tid = self.get_tile_at(fx, fy)
-                    if tid == SIGN_TILE:
-                        self.dialogue.show("The sign reads: Welcome to Route 1!")
+                    text = self.interaction_at(*self.get_front_tile())
+                    if text:
+                        self.dialogue.show(text)
                     return
 
         # Battle input
@@ -169,7 +505,9 @@ class Overworld:
     # -----------------------------------------------------
     # Update
     # -----------------------------------------------------
-    def update(self, dt):
+    def update(self, dt, keys=None):
+        self.journal_tick()
+
         # timers always tick
         if self.popup_timer > 0:
             self.popup_timer = max(0.0, self.popup_timer - dt)
@@ -182,7 +520,9 @@ class Overworld:
 
         # Battle update
         if self.mode == "battle" and self.battle:
+            profiler.begin("battle.update")
             self.battle.update(dt)
+            profiler.end("battle.update")
             # keep battle synced to active
             self.battle.player = self.inventory.active
 
@@ -192,47 +532,61 @@ class Overworld:
                 self.encounter_cd = 0.8
             return
 
-        # World update (movement can be locked)
-        old = self.player.rect.copy()
+        profiler.begin("overworld.update")
+        self.update_world(dt, keys)
+        profiler.end("overworld.update")
+
+    def update_world(self, dt, keys=None):
+        # World update (movement can be locked); collision is resolved
+        # inside the move so the player never ends up in a blocking tile
+        self.stream_regions()
+        if self.paths:
+            self.paths.update()
+        self.player.begin_step()
         if not self.movement_locked():
-            self.player.update(dt)
+            self.player.update(dt, self.is_blocked, keys)
 
         # Resolve current player tile + collisions/items/encounters
         tx, ty = self.get_player_tile()
-        tid = self.get_tile_at(tx, ty)
+        flags = self.flags.at(tx, ty)
 
-        # Out of bounds = revert
-        if tid is None:
-            self.player.rect = old
+        # Off the map: only possible through an edge into the next map
+        if flags is None:
+            self.take_edge(tx, ty)
             return
 
-        # Blocking collision
-        if tid in BLOCKING_TILES:
-            self.player.rect = old
-            return
+        self.preload_exits(tx, ty)
+
+        # Warps fire when stepping onto the tile
+        if (tx, ty) != self.arrival_tile:
+            self.arrival_tile = None
+            info = self.map_info
+            warp = info.warps.get((tx, ty)) if info else None
+            if warp and not self.movement_locked():
+                self.enter_map(warp.map, warp.tx * TILE_SIZE, warp.ty * TILE_SIZE)
+                return
 
         # Item pickups (only when movement not locked)
-        if not self.movement_locked():
+        if flags & PICKUP and not self.movement_locked():
+            tid = self.world[ty][tx]
             if tid == POTION_TILE:
                 self.inventory.potions += 1
-                self.world[ty][tx] = BASE_GRASS_TILE
+                self.set_tile(tx, ty, BASE_GRASS_TILE)
                 self.show_popup(f"Picked up Potion x{self.inventory.potions}")
 
             elif tid == CAPTURE_BALL_TILE:
                 self.inventory.capture_balls += 1
-                self.world[ty][tx] = BASE_GRASS_TILE
+                self.set_tile(tx, ty, BASE_GRASS_TILE)
                 self.show_popup(f"Picked up Capture Ball x{self.inventory.capture_balls}")
 
         # Interact hint (based on FRONT tile, not current tile)
         self.show_interact = False
-        fx, fy = self.get_front_tile()
-        ftid = self.get_tile_at(fx, fy)
-        if ftid == SIGN_TILE and self.mode == "world" and not self.pause.open:
+        if self.mode == "world" and not self.pause.open and self.interaction_at(*self.get_front_tile()):
             self.show_interact = True
 
         # Encounters (only if movement not locked)
         if (not self.movement_locked()
-                and tid in ENCOUNTER_TILES
+                and flags & ENCOUNTER
                 and self.encounter_cd <= 0
                 and (tx, ty) != self.last_tile):
             self.last_tile = (tx, ty)
@@ -242,23 +596,23 @@ class Overworld:
                 self.mode = "battle"
                 return
 
-        # Camera
-        map_w = len(self.world[0]) * TILE_SIZE * SCREEN_SCALE
-        map_h = len(self.world) * TILE_SIZE * SCREEN_SCALE
+    def update_camera(self, cx, cy):
+        # Camera (in view pixels), centred on world point (cx, cy)
+        scale = self.render_scale
+        map_w = len(self.world[0]) * TILE_SIZE * scale
+        map_h = len(self.world) * TILE_SIZE * scale
 
-        self.camx = int(self.player.rect.centerx * SCREEN_SCALE) - SCREEN_W // 2
-        self.camy = int(self.player.rect.centery * SCREEN_SCALE) - SCREEN_H // 2
+        self.camx = int(cx * scale) - self.view_w // 2
+        self.camy = int(cy * scale) - self.view_h // 2
 
         # Clamp camera to map bounds
-        self.camx = max(0, min(self.camx, map_w - SCREEN_W))
-        self.camy = max(0, min(self.camy, map_h - SCREEN_H))
+        self.camx = max(0, min(self.camx, map_w - self.view_w))
+        self.camy = max(0, min(self.camy, map_h - self.view_h))
 
     # -----------------------------------------------------
     # Draw helpers
     # -----------------------------------------------------
     def draw_hud(self):
-        font = pygame.font.SysFont(None, 22)
-
         box_w = 220
         box_h = 90
         x = SCREEN_W - box_w - 12
@@ -276,13 +630,12 @@ class Overworld:
             f"Capture Balls : {self.inventory.capture_balls}"
         ]
         for i, line in enumerate(lines):
-            self.screen.blit(font.render(line, True, (255, 255, 255)), (x + 12, y + 10 + i * 20))
+            self.screen.blit(render_text(line, 22, (255, 255, 255)), (x + 12, y + 10 + i * 20))
 
     def draw_pickup_popup(self):
         if self.popup_timer <= 0:
             return
 
-        font = pygame.font.SysFont(None, 22)
         box_w, box_h = 220, 32
         x = SCREEN_W - box_w - 12
         y = 12 + 90 + 8  # under HUD
@@ -291,16 +644,18 @@ class Overworld:
         panel.set_alpha(180)
         panel.fill((0, 0, 0))
         self.screen.blit(panel, (x, y))
-        self.screen.blit(font.render(self.popup_text, True, (255, 255, 255)), (x + 10, y + 8))
+        self.screen.blit(render_text(self.popup_text, 22, (255, 255, 255)), (x + 10, y + 8))
 
     def draw_interact_hint(self):
         if not self.show_interact:
             return
-        font = pygame.font.SysFont(None, 20)
-        txt = font.render("E : Interact", True, (255, 255, 255))
+        txt = render_text("E : Interact", 20, (255, 255, 255))
 
-        bx = self.player.rect.x * SCREEN_SCALE - self.camx + 8
-        by = self.player.rect.y * SCREEN_SCALE - self.camy - 20
+        # world -> view -> window coordinates
+        up = SCREEN_W // self.view_w
+        px, py = self.player_draw_pos
+        bx = (int(px * self.render_scale) - self.camx) * up + 8
+        by = (int(py * self.render_scale) - self.camy) * up - 20
 
         panel = pygame.Surface((txt.get_width() + 12, txt.get_height() + 6))
         panel.set_alpha(180)
@@ -311,45 +666,142 @@ class Overworld:
     # -----------------------------------------------------
     # Draw
     # -----------------------------------------------------
-    def draw(self):
+    def invalidate(self):
+        # force a full redraw on the next frame
+        self.drawn_base_key = None
+
+    def base_key(self):
+        # Everything the base layer (world or battle + HUD) depends on.
+        # Equal keys on consecutive frames mean the base is unchanged.
+        if self.mode == "battle" and self.battle:
+            return ("battle", self.screen.get_size(), self.battle.view_key())
+
+        px, py = self.player_draw_pos
+        return ("world", self.camx, self.camy,
+                int(px * self.render_scale), int(py * self.render_scale),
+                self.player.dir, self.player.frame, self.world_version, self.entities.version,
+                self.inventory.potions, self.inventory.capture_balls,
+                self.popup_timer > 0 and self.popup_text, self.show_interact)
+
+    def overlay_key(self):
+        if self.mode == "battle" and self.battle:
+            return (None, self.party_menu.view_key(self.inventory), None)
+        return (self.pause.view_key(), self.party_menu.view_key(self.inventory),
+                self.dialogue.view_key())
+
+    def entity_image(self, sprite):
+        img = self.entity_images.get(sprite)
+        if img is None:
+            size = TILE_SIZE * self.render_scale
+            img = pygame.transform.scale(load_image(os.path.join(OVERWORLD_DIR, sprite)), (size, size))
+            self.entity_images[sprite] = img
+        return img
+
+    def draw_entities(self):
+        # only what the spatial hash finds in view (plus a tile of margin)
+        ts = TILE_SIZE * self.render_scale
+        x0, y0 = self.camx // ts - 1, self.camy // ts - 1
+        x1 = (self.camx + self.view_w) // ts + 2
+        y1 = (self.camy + self.view_h) // ts + 2
+        pos = self.entities.pos
+        for e in sorted(self.entities.in_rect(x0, y0, x1, y1), key=lambda e: pos[e][1]):
+            if e.sprite:
+                tx, ty = pos[e]
+                self.view.blit(self.entity_image(e.sprite), (tx * ts - self.camx, ty * ts - self.camy))
+
+    def draw_base(self):
         # Battle draw
         if self.mode == "battle" and self.battle:
+            profiler.begin("draw.battle")
             self.battle.draw()
-            if self.party_menu.open:
-                self.party_menu.draw(self.screen, SCREEN_W, SCREEN_H, self.inventory)
+            profiler.end("draw.battle")
             return
 
-        # World draw: map
-        tile_px = TILE_SIZE * SCREEN_SCALE
+        # World draw: map (pre-rendered chunks)
+        profiler.begin("draw.map")
+        self.chunks.draw(self.view, self.camx, self.camy, self.view_w, self.view_h)
+        profiler.end("draw.map")
 
-        start_x = max(0, self.camx // tile_px)
-        start_y = max(0, self.camy // tile_px)
+        # Entities on screen, then the player
+        profiler.begin("draw.sprites")
+        self.draw_entities()
+        self.player.draw(self.view, self.camx, self.camy, self.render_scale, self.player_draw_pos)
+        profiler.end("draw.sprites")
 
-        end_x = min(len(self.world[0]), (self.camx + SCREEN_W) // tile_px + 2)
-        end_y = min(len(self.world), (self.camy + SCREEN_H) // tile_px + 2)
-
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                tid = self.world[y][x]
-                self.screen.blit(
-                    self.tiles[tid],
-                    (x * tile_px - self.camx,
-                     y * tile_px - self.camy)
-                )
-
-        # Player
-        self.player.draw(self.screen, self.camx, self.camy)
+        # Upscale the base-resolution world to the window in one pass
+        profiler.begin("draw.map")
+        if self.view is not self.screen:
+            pygame.transform.scale(self.view, (SCREEN_W, SCREEN_H), self.screen)
+        profiler.end("draw.map")
 
         # UI (HUD + pickup popup + interact hint)
+        profiler.begin("draw.ui")
         self.draw_hud()
         self.draw_pickup_popup()
         self.draw_interact_hint()
+        profiler.end("draw.ui")
+
+    def draw_overlays(self):
+        profiler.begin("draw.ui")
+        rects = self._draw_overlays()
+        profiler.end("draw.ui")
+        return rects
+
+    def _draw_overlays(self):
+        # Menus and dialogue always on top; returns the rects they covered
+        rects = []
+        if self.mode == "battle" and self.battle:
+            if self.party_menu.open:
+                rects.append(self.party_menu.draw(self.screen, SCREEN_W, SCREEN_H, self.inventory))
+            return [r for r in rects if r]
 
-        # Menus and dialogue always on top
         if self.pause.open:
-            self.pause.draw(self.screen, SCREEN_W, SCREEN_H)
+            rects.append(self.pause.draw(self.screen, SCREEN_W, SCREEN_H))
 
         if self.party_menu.open:
-            self.party_menu.draw(self.screen, SCREEN_W, SCREEN_H, self.inventory)
-
-        self.dialogue.draw(self.screen, SCREEN_W, SCREEN_H)
+            rects.append(self.party_menu.draw(self.screen, SCREEN_W, SCREEN_H, self.inventory))
+
+        rects.append(self.dialogue.draw(self.screen, SCREEN_W, SCREEN_H))
+        return [r for r in rects if r]
+
+    def draw(self, alpha=1.0):
+        """Draw the frame and return the list of window rects that changed.
+
+        alpha: how far we are between the last two simulation steps, used
+        to interpolate the player and camera. An empty list means the frame
+        is identical to the last one and does not need presenting.
+        """
+        if not (self.mode == "battle" and self.battle):
+            # Interpolated player position drives the camera
+            self.player_draw_pos = self.player.render_pos(alpha)
+            px, py = self.player_draw_pos
+            self.update_camera(px + TILE_SIZE / 2, py + TILE_SIZE / 2)
+
+        base_key = self.base_key()
+        overlay_key = self.overlay_key()
+
+        if base_key != self.drawn_base_key:
+            self.draw_base()
+            self.drawn_base_key = base_key
+            # remember what is under the overlays so they can be redrawn alone
+            self.backdrop = self.screen.copy() if any(overlay_key) else None
+            self.overlay_rects = self.draw_overlays()
+            self.drawn_overlay_key = overlay_key
+            return [self.screen.get_rect()]
+
+        if overlay_key == self.drawn_overlay_key:
+            return []
+
+        # Only overlays changed: restore what they covered, then redraw them
+        dirty = list(self.overlay_rects)
+        if self.backdrop is None:
+            self.backdrop = self.screen.copy()
+        else:
+            for r in dirty:
+                self.screen.blit(self.backdrop, r, r)
+
+        self.overlay_rects = self.draw_overlays()
+        self.drawn_overlay_key = overlay_key
+        if not any(overlay_key):
+            self.backdrop = None
+        return dirty + self.overlay_rects
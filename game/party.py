@@ -1,4 +1,5 @@
 import pygame
+from game.fonts import render_text
 
 class PartyMenu:
     def __init__(self):
@@ -95,22 +96,27 @@ class PartyMenu:
 
         return None
 
+    # ----------------------------
+    def view_key(self, inventory):
+        # what draw() depends on; None when nothing is drawn
+        if not self.open or not inventory.party:
+            return None
+        return (self.index, self.action_open, self.action_index,
+                id(inventory.active),
+                tuple((id(m), m.hp) for m in inventory.party))
+
     # ----------------------------
     def draw(self, screen, SW, SH, inventory):
         party = inventory.party
         if not party:
-            return
+            return None
 
         # dark overlay
         panel = pygame.Surface((SW, SH), pygame.SRCALPHA)
         panel.fill((0, 0, 0, 200))
-        screen.blit(panel, (0, 0))
-
-        title_font = pygame.font.SysFont(None, 56, bold=True)
-        ui = pygame.font.SysFont(None, 32, bold=True)
-        small = pygame.font.SysFont(None, 26)
+        rect = screen.blit(panel, (0, 0))
 
-        title = title_font.render("PARTY", True, (255,255,255))
+        title = render_text("PARTY", 56, (255,255,255), bold=True)
         screen.blit(title, (SW//2 - title.get_width()//2, 36))
 
         list_x = 80
@@ -127,15 +133,15 @@ class PartyMenu:
             pygame.draw.rect(screen, bg, (list_x, y, box_w, row_h-10), border_radius=14)
             pygame.draw.rect(screen, (255,255,255), (list_x, y, box_w, row_h-10), 2, border_radius=14)
 
-            spr = pygame.transform.scale(mon.sprite, (56,56))
+            spr = mon.scaled_sprite((56,56))
             screen.blit(spr, (list_x + 16, y + 8))
 
             name = mon.name + ("  (ACTIVE)" if mon is inventory.active else "")
-            screen.blit(ui.render(name, True, (255,255,255)), (list_x + 92, y + 10))
-            screen.blit(small.render(f"HP {mon.hp}/{mon.max_hp}", True, (220,220,220)), (list_x + 92, y + 44))
+            screen.blit(render_text(name, 32, (255,255,255), bold=True), (list_x + 92, y + 10))
+            screen.blit(render_text(f"HP {mon.hp}/{mon.max_hp}", 26, (220,220,220)), (list_x + 92, y + 44))
 
         # footer hint
-        hint = small.render("UP/DOWN select • ENTER actions • ESC/BKSP back", True, (200,200,200))
+        hint = render_text("UP/DOWN select • ENTER actions • ESC/BKSP back", 26, (200,200,200))
         screen.blit(hint, (SW//2 - hint.get_width()//2, SH - 38))
 
         # action popup
@@ -147,9 +153,11 @@ class PartyMenu:
             pygame.draw.rect(screen, (20,20,50), (ax, ay, w, h), border_radius=18)
             pygame.draw.rect(screen, (255,255,255), (ax, ay, w, h), 2, border_radius=18)
 
-            t = ui.render("ACTIONS", True, (255,255,255))
+            t = render_text("ACTIONS", 32, (255,255,255), bold=True)
             screen.blit(t, (ax + w//2 - t.get_width()//2, ay + 18))
 
             for i, a in enumerate(self.actions):
                 col = (255,220,80) if i == self.action_index else (230,230,230)
-                screen.blit(ui.render(a, True, col), (ax + 40, ay + 70 + i * 34))
+                screen.blit(render_text(a, 32, col, bold=True), (ax + 40, ay + 70 + i * 34))
+
+        return rect
@@ -0,0 +1,413 @@
+import heapq
+from bisect import bisect_right
+from collections import OrderedDict, deque
+
+from game.config import PATH_CACHE_SIZE, PATH_REGION_TILES, PATH_EXPANSIONS_PER_TICK
+from game.tileflags import BLOCKING
+
+# A* over one map's FlagGrid for NPC movement (4-way, unit cost).
+#
+# - Connected components of walkable cells are labelled when the map loads
+#   (on the map loader's thread, see MapCache.load), so a query between two
+#   components fails at once instead of flooding the map. Edits update the
+#   labels in place; after a cell is closed the map is relabelled within
+#   update()'s budget.
+# - Found paths are cached; a tile edit only drops paths that pass through
+#   its PATH_REGION_TILES-square region, and only if walkability changed
+#   (picking up an item does not touch the cache).
+# - request() queues a search; update() runs queued searches for at most
+#   PATH_EXPANSIONS_PER_TICK node expansions, so hundreds of NPCs asking at
+#   once are spread over several ticks. The budget is counted in nodes, not
+#   time, so replays stay deterministic.
+#
+# Solid entities (see watch()) move too often to be part of the labels.
+# They are dynamic obstacles instead: searches step around them as they
+# expand, and a cached path is dropped when asked for if one stands on it.
+# A move never restarts a search or a relabel. `start` may be blocked (an
+# NPC's own tile); paths leave it through a neighbour.
+#
+# Paths are lists of (tx, ty) from the step after `start` up to `goal`;
+# None means unreachable.
+
+SLICE = 256   # expansions between budget checks
+
+
+class PathRequest:
+    __slots__ = ("start", "goal", "path", "done", "cancelled")
+
+    def __init__(self, start, goal):
+        self.start = start
+        self.goal = goal
+        self.path = None
+        self.done = False
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Components:
+    """Connected-component label per walkable cell, stored as runs per row.
+
+    Run ids are joined with union-find; label() resolves them. Opening a
+    cell merges exactly. Closing one only splits its run, so two cells may
+    still share a label after a wall cuts them apart (never the other way
+    round): a search then runs and fails, and PathService relabels the map
+    in the background of update().
+    """
+
+    def __init__(self, w, h):
+        self.w = w
+        self.h = h
+        self.rows = []     # per row: (starts, ends, ids)
+        self.parent = []   # run id -> parent id
+
+    def find(self, a):
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[a] = b
+
+    def build(self, walk):
+        """Label `walk` (padded, see PathService). A generator yielding
+        every SLICE // 4 runs, so a rebuild can be spread over ticks."""
+        w, parent = self.w, self.parent
+        prev = None
+        n = 0
+        for y in range(self.h):
+            base = (y + 1) * (w + 2) + 1
+            starts, ends, ids = [], [], []
+            x = walk.find(1, base, base + w)
+            while x != -1:
+                end = walk.find(0, x, base + w)
+                if end == -1:
+                    end = base + w
+                starts.append(x - base)
+                ends.append(end - base)
+                ids.append(len(parent))
+                parent.append(len(parent))
+                x = walk.find(1, end, base + w)
+
+            # join runs that overlap a run in the row above
+            if prev:
+                ps, pe, pi = prev
+                i = j = 0
+                while i < len(starts) and j < len(ps):
+                    if starts[i] < pe[j] and ps[j] < ends[i]:
+                        self.union(ids[i], pi[j])
+                    if ends[i] < pe[j]:
+                        i += 1
+                    else:
+                        j += 1
+            self.rows.append((starts, ends, ids))
+            prev = self.rows[-1]
+
+            n += len(starts) + 1
+            if n >= SLICE // 4:   # a run costs about four node expansions
+                n = 0
+                yield True
+
+    def run_id(self, tx, ty):
+        starts, ends, ids = self.rows[ty]
+        i = bisect_right(starts, tx) - 1
+        if i >= 0 and tx < ends[i]:
+            return ids[i]
+        return None
+
+    def label(self, tx, ty):
+        """Component of a cell, or None when it is blocked."""
+        a = self.run_id(tx, ty)
+        return None if a is None else self.find(a)
+
+    def opened(self, tx, ty):
+        starts, ends, ids = self.rows[ty]
+        i = bisect_right(starts, tx)
+        left = i > 0 and ends[i - 1] == tx
+        right = i < len(starts) and starts[i] == tx + 1
+        if left and right:
+            ends[i - 1] = ends[i]
+            self.union(ids[i], ids[i - 1])
+            del starts[i], ends[i], ids[i]
+            a = ids[i - 1]
+        elif left:
+            ends[i - 1] = tx + 1
+            a = ids[i - 1]
+        elif right:
+            starts[i] = tx
+            a = ids[i]
+        else:
+            a = len(self.parent)
+            self.parent.append(a)
+            starts.insert(i, tx)
+            ends.insert(i, tx + 1)
+            ids.insert(i, a)
+        for y in (ty - 1, ty + 1):
+            if 0 <= y < self.h:
+                b = self.run_id(tx, y)
+                if b is not None:
+                    self.union(a, b)
+
+    def closed(self, tx, ty):
+        starts, ends, ids = self.rows[ty]
+        i = bisect_right(starts, tx) - 1
+        s, e, a = starts[i], ends[i], ids[i]
+        pieces = [(x0, x1) for x0, x1 in ((s, tx), (tx + 1, e)) if x0 < x1]
+        starts[i:i + 1] = [x0 for x0, _ in pieces]
+        ends[i:i + 1] = [x1 for _, x1 in pieces]
+        ids[i:i + 1] = [a] * len(pieces)
+
+
+class PathService:
+    def __init__(self, flags, cache_size=PATH_CACHE_SIZE, region=PATH_REGION_TILES):
+        self.flags = flags
+        self.w = flags.w
+        self.h = flags.h
+        # walkable bytes with a blocked border, so A* needs no bounds checks
+        pw = self.w + 2
+        self.walk = bytearray(pw * (self.h + 2))
+        cells = flags.walkable()
+        for y in range(self.h):
+            self.walk[(y + 1) * pw + 1:(y + 1) * pw + 1 + self.w] = cells[y * self.w:(y + 1) * self.w]
+        self.free = bytearray(self.walk)   # walk minus solid entities: what A* expands
+        self.components = None   # labels of `walk`; None until built
+        self.relabel = None      # (Components, generator) being built in update()
+        self.stale = True        # labels may join cells a wall has cut apart
+        self.solid = {}          # padded index -> number of solid entities there
+        self.region = region
+
+        self.cache_size = cache_size
+        self.cache = OrderedDict()   # (start, goal) -> path, LRU order
+        self.by_region = {}          # (rx, ry) -> {(start, goal)} through it
+
+        self.queue = deque()
+        self.search = None           # (request, generator) in progress
+
+    # -----------------------------------------------------
+    # Queries
+    # -----------------------------------------------------
+    def label_all(self):
+        """Build the labels right now (map loader thread)."""
+        c = Components(self.w, self.h)
+        for _ in c.build(self.walk):
+            pass
+        self.components, self.relabel, self.stale = c, None, False
+
+    def reachable(self, start, goal):
+        """False only when no path exists; True may still fail the search."""
+        if not (self.inside(start) and self.inside(goal)):
+            return False
+        c = self.components
+        if c is None:
+            return True   # not labelled yet: let the search decide
+        g = c.label(*goal)
+        if g is None:
+            return False
+        a = c.label(*start)
+        if a is None:   # standing on a blocked tile: leave through a neighbour
+            x, y = start
+            return any(self.inside(n) and c.label(*n) == g
+                       for n in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)))
+        return a == g
+
+    def inside(self, t):
+        return 0 <= t[0] < self.w and 0 <= t[1] < self.h
+
+    def index(self, tx, ty):
+        return (ty + 1) * (self.w + 2) + tx + 1
+
+    def cached(self, key):
+        """A cached path, unless a solid entity now stands on it."""
+        path = self.cache.get(key)
+        if path is None:
+            return None
+        free, index = self.free, self.index
+        if all(free[index(x, y)] for x, y in path):
+            self.cache.move_to_end(key)
+            return path
+        self._drop(key)
+        return None
+
+    def request(self, start, goal):
+        """Queue a search; answered now when cached or unreachable."""
+        req = PathRequest(start, goal)
+        key = (start, goal)
+        path = self.cached(key)
+        if path is not None:
+            req.path, req.done = path, True
+        elif not self.reachable(start, goal) or self.index(*goal) in self.solid:
+            req.done = True
+        else:
+            self.queue.append(req)
+        return req
+
+    def find(self, start, goal):
+        """The path right now, ignoring the budget (tools, one-off queries)."""
+        req = self.request(start, goal)
+        if not req.done:
+            self.queue.remove(req)
+            for _ in self._search(req):
+                pass
+        return req.path
+
+    def update(self, budget=PATH_EXPANSIONS_PER_TICK):
+        """Run queued searches for up to `budget` node expansions; call once per tick.
+
+        Relabelling, when needed, goes first, charged about four units a run.
+        """
+        while budget > 0 and self.stale:
+            if self.relabel is None:
+                c = Components(self.w, self.h)
+                self.relabel = (c, c.build(self.walk))
+            c, steps = self.relabel
+            budget -= SLICE
+            if next(steps, None) is None:
+                self.components, self.relabel, self.stale = c, None, False
+
+        while budget > 0:
+            if self.search is None:
+                if not self.queue:
+                    return
+                req = self.queue.popleft()
+                if req.cancelled:
+                    continue
+                self.search = (req, self._search(req))
+            req, steps = self.search
+            if req.cancelled:
+                self.search = None
+                continue
+            budget -= SLICE   # a finishing step may use less; close enough
+            if next(steps, None) is None:
+                self.search = None
+
+    # -----------------------------------------------------
+    # Search
+    # -----------------------------------------------------
+    def _search(self, req):
+        # Generator: yields True every SLICE expansions, finishes with
+        # req.done set (and the path cached)
+        key = (req.start, req.goal)
+        path = self.cached(key)
+        if path is not None:
+            req.path, req.done = path, True
+            return
+
+        # `free` is read live, so entities moving mid-search are seen from
+        # then on (the path is a plan; the mover checks each step anyway)
+        pw, walk = self.w + 2, self.free
+        push, pop = heapq.heappush, heapq.heappop
+        gx, gy = req.goal[0] + 1, req.goal[1] + 1
+        start = (req.start[1] + 1) * pw + req.start[0] + 1
+        goal = gy * pw + gx
+        came = {start: -1}   # also the closed/open set
+        cost = {start: 0}
+        heap = [(0, 0, start)]
+        n = 0
+        while heap:
+            _, g, i = pop(heap)
+            if i == goal:
+                break
+            if g > cost[i]:
+                continue
+            n += 1
+            if n % SLICE == 0:
+                yield True
+
+            g += 1
+            for j in (i - 1, i + 1, i - pw, i + pw):
+                if walk[j] and g < cost.get(j, 1 << 30):
+                    cost[j] = g
+                    came[j] = i
+                    y, x = divmod(j, pw)
+                    push(heap, (g + abs(x - gx) + abs(y - gy), g, j))
+
+        path = None
+        if goal in came:
+            path = []
+            i = goal
+            while i != start:
+                y, x = divmod(i, pw)
+                path.append((x - 1, y - 1))
+                i = came[i]
+            path.reverse()
+        req.path, req.done = path, True
+        if path is not None:
+            self._store(key, path)
+
+    # -----------------------------------------------------
+    # Cache
+    # -----------------------------------------------------
+    def _regions(self, key, path):
+        r = self.region
+        return {(x // r, y // r) for x, y in path} | {(key[0][0] // r, key[0][1] // r)}
+
+    def _store(self, key, path):
+        self.cache[key] = path
+        for reg in self._regions(key, path):
+            self.by_region.setdefault(reg, set()).add(key)
+        while len(self.cache) > self.cache_size:
+            self._drop(next(iter(self.cache)))
+
+    def _drop(self, key):
+        path = self.cache.pop(key)
+        for reg in self._regions(key, path):
+            keys = self.by_region.get(reg)
+            if keys:
+                keys.discard(key)
+
+    # -----------------------------------------------------
+    # Changes
+    # -----------------------------------------------------
+    def watch(self, entities):
+        """Step around solid entities in a SpatialHash."""
+        for obj in entities:
+            self.entity_moved(obj, None, entities.position(obj))
+        entities.on_move = self.entity_moved
+
+    def entity_moved(self, obj, old, new):
+        # only `free` changes: no labels, cache entries or searches are touched
+        if not getattr(obj, "solid", False):
+            return
+        solid = self.solid
+        if old is not None and self.inside(old):
+            i = self.index(*old)
+            solid[i] -= 1
+            if not solid[i]:
+                del solid[i]
+                self.free[i] = self.walk[i]
+        if new is not None and self.inside(new):
+            i = self.index(*new)
+            solid[i] = solid.get(i, 0) + 1
+            self.free[i] = 0
+
+    def tile_changed(self, tx, ty):
+        """Call after the map's flags change at (tx, ty)."""
+        i = self.index(tx, ty)
+        walkable = 0 if self.flags.at(tx, ty) & BLOCKING else 1
+        if self.walk[i] == walkable:
+            return
+        self.walk[i] = walkable
+        self.free[i] = 0 if i in self.solid else walkable
+        if self.components is not None:
+            if walkable:
+                self.components.opened(tx, ty)
+            else:
+                self.components.closed(tx, ty)
+        if not walkable:
+            self.stale = True
+        self.relabel = None   # a rebuild in progress read the old grid
+
+        r = self.region
+        for key in list(self.by_region.pop((tx // r, ty // r), ())):
+            if key in self.cache:
+                self._drop(key)
+
+        # the search in progress saw the old grid: start it again
+        if self.search is not None:
+            self.queue.appendleft(self.search[0])
+            self.search = None
@@ -1,10 +1,11 @@
 import pygame
+from game.fonts import render_text
 
 class PauseMenu:
     def __init__(self):
         self.open = False
         self.cursor = 0
-        self.options = ["RESUME", "BAG", "PARTY", "QUIT"]
+        self.options = ["RESUME", "BAG", "PARTY", "SAVE", "QUIT"]
 
     def toggle(self):
         self.open = not self.open
@@ -29,19 +30,26 @@ class PauseMenu:
                         # 🔥 Tell overworld to open party menu
                         return "party"
 
+                    elif choice == "SAVE":
+                        return "save"
+
                     elif choice == "QUIT":
-                        pygame.quit()
-                        exit()
+                        # let the main loop shut down cleanly
+                        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
 
+    def view_key(self):
+        # what draw() depends on; None when nothing is drawn
+        return (self.cursor,) if self.open else None
 
     def draw(self, screen, w, h):
-        panel = pygame.Surface((300, 240))
+        ph = 60 + len(self.options) * 45
+        panel = pygame.Surface((300, ph))
         panel.fill((25, 25, 60))
-        pygame.draw.rect(panel,(255,255,255),(0,0,300,240),3)
+        pygame.draw.rect(panel,(255,255,255),(0,0,300,ph),3)
 
-        font = pygame.font.SysFont(None,36)
         for i,opt in enumerate(self.options):
             col = (255,255,0) if i==self.cursor else (230,230,230)
-            panel.blit(font.render(opt,True,col),(60,50+i*45))
+            panel.blit(render_text(opt,36,col),(60,30+i*45))
 
-        screen.blit(panel,(w//2-150,h//2-120))
+        return screen.blit(panel,(w//2-150,h//2-ph//2))
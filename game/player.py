@@ -1,5 +1,11 @@
 import pygame, os
 from game.config import TILE_SIZE, SCREEN_SCALE, OVERWORLD_DIR
+from game.assets import load_image
+from game.collision import move_box
+
+# Collision box inset from the 32x32 sprite, so the player fits through
+# one-tile gaps without pixel-perfect alignment
+HITBOX_INSET = 8
 
 def load_player_sprites():
     base = os.path.join(OVERWORLD_DIR, "player")
@@ -7,7 +13,7 @@ def load_player_sprites():
 
     for d in ["down","up","right"]:
         for i in range(2):
-            img = pygame.image.load(f"{base}/{d}_{i}.png").convert_alpha()
+            img = load_image(f"{base}/{d}_{i}.png")
             frames[d].append(img)
     for i in range(2):
         frames["left"].append(pygame.transform.flip(frames["right"][i],True,False))
@@ -16,22 +22,57 @@ def load_player_sprites():
 class OverworldPlayer:
     def __init__(self,x,y,frames):
         self.rect = pygame.Rect(x,y,TILE_SIZE,TILE_SIZE)
+        self.x=float(x); self.y=float(y)   # sub-pixel position, rect follows it
+        self.prev_x=self.x; self.prev_y=self.y   # position at the start of the last step
         self.frames = frames
         self.dir="down"
         self.frame=0
         self.timer=0
         self.speed=90
+        self.scaled={}   # (dir, frame, scale) -> pre-scaled frame
+
+    def place(self,x,y):
+        self.x=float(x); self.y=float(y)
+        self.rect.topleft=(int(self.x),int(self.y))
+
+    def teleport(self,x,y):
+        # no interpolation across a jump
+        self.place(x,y)
+        self.prev_x=self.x; self.prev_y=self.y
+
+    def begin_step(self):
+        self.prev_x=self.x; self.prev_y=self.y
+
+    def render_pos(self,alpha):
+        return (self.prev_x+(self.x-self.prev_x)*alpha,
+                self.prev_y+(self.y-self.prev_y)*alpha)
 
-    def update(self,dt):
-        keys=pygame.key.get_pressed()
-        vx=vy=0
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]: vx=-1; self.dir="left"
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]: vx=1; self.dir="right"
-        if keys[pygame.K_w] or keys[pygame.K_UP]: vy=-1; self.dir="up"
-        if keys[pygame.K_s] or keys[pygame.K_DOWN]: vy=1; self.dir="down"
+    def hitbox(self):
+        size=TILE_SIZE-2*HITBOX_INSET
+        return self.x+HITBOX_INSET,self.y+HITBOX_INSET,size,size
 
-        self.rect.x+=vx*self.speed*dt
-        self.rect.y+=vy*self.speed*dt
+    @staticmethod
+    def read_input(keys):
+        # -> (vx, vy, facing or None)
+        vx=vy=0; d=None
+        if keys[pygame.K_a] or keys[pygame.K_LEFT]: vx=-1; d="left"
+        if keys[pygame.K_d] or keys[pygame.K_RIGHT]: vx=1; d="right"
+        if keys[pygame.K_w] or keys[pygame.K_UP]: vy=-1; d="up"
+        if keys[pygame.K_s] or keys[pygame.K_DOWN]: vy=1; d="down"
+        return vx,vy,d
+
+    def is_still(self):
+        return self.x==self.prev_x and self.y==self.prev_y and self.frame==0
+
+    def update(self,dt,is_blocked,keys=None):
+        if keys is None: keys=pygame.key.get_pressed()
+        vx,vy,d=self.read_input(keys)
+        if d: self.dir=d
+
+        if vx or vy:
+            hx,hy,hw,hh=self.hitbox()
+            nx,ny,_,_=move_box(hx,hy,hw,hh,vx*self.speed*dt,vy*self.speed*dt,is_blocked)
+            self.place(nx-HITBOX_INSET,ny-HITBOX_INSET)
 
         if vx or vy:
             self.timer+=dt
@@ -39,8 +80,14 @@ class OverworldPlayer:
                 self.timer=0; self.frame=1-self.frame
         else: self.frame=0
 
-    def draw(self,screen,camx,camy):
-        img=self.frames[self.dir][self.frame]
-        img=pygame.transform.scale(img,(TILE_SIZE*SCREEN_SCALE,TILE_SIZE*SCREEN_SCALE))
-        screen.blit(img,(self.rect.x*SCREEN_SCALE-camx,
-                          self.rect.y*SCREEN_SCALE-camy))
+    def draw(self,screen,camx,camy,scale=SCREEN_SCALE,pos=None):
+        # source frames are not tile-sized (the PNGs are large), so scale
+        # even at scale 1
+        key=(self.dir,self.frame,scale)
+        img=self.scaled.get(key)
+        if img is None:
+            img=pygame.transform.scale(self.frames[self.dir][self.frame],(TILE_SIZE*scale,TILE_SIZE*scale))
+            self.scaled[key]=img
+        px,py=pos if pos else self.rect.topleft
+        screen.blit(img,(int(px*scale)-camx,
+                          int(py*scale)-camy))
@@ -0,0 +1,158 @@
+import csv
+import time
+from collections import deque
+
+import pygame
+
+from game.config import PROFILER_WINDOW, PROFILER_CSV_PATH
+from game.fonts import render_text
+
+# Per-frame timing of the main subsystems. Call sites wrap work in
+# profiler.begin(name) / profiler.end(name); both return immediately while
+# the profiler is off, so leaving them in costs next to nothing.
+
+SECTIONS = (
+    "events",
+    "overworld.update",
+    "battle.update",
+    "draw.map",
+    "draw.sprites",
+    "draw.battle",
+    "draw.ui",
+    "present",
+)
+
+PANEL_REFRESH_FRAMES = 15
+
+
+class FrameProfiler:
+    def __init__(self, window=PROFILER_WINDOW):
+        self.enabled = False   # collecting samples
+        self.visible = False   # overlay shown
+        self.samples = {name: deque(maxlen=window) for name in SECTIONS + ("frame",)}
+        self.current = {}      # name -> seconds spent this frame
+        self.started = {}
+        self.frame_start = None
+        self.frame_index = 0
+        self.panel = None
+        self.panel_frame = 0
+
+        self.csv_path = None
+        self.csv_file = None
+        self.csv_writer = None
+
+    # -----------------------------------------------------
+    # Timing
+    # -----------------------------------------------------
+    def begin(self, name):
+        if self.enabled:
+            self.started[name] = time.perf_counter()
+
+    def end(self, name):
+        if self.enabled:
+            start = self.started.pop(name, None)
+            if start is not None:   # None: profiler was switched on mid-section
+                self.current[name] = self.current.get(name, 0.0) + time.perf_counter() - start
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        frame = now - self.frame_start if self.frame_start is not None else 0.0
+        self.frame_start = now
+
+        for name in SECTIONS:
+            self.samples[name].append(self.current.get(name, 0.0))
+        self.samples["frame"].append(frame)
+
+        if self.csv_writer:
+            self.csv_writer.writerow(
+                [self.frame_index] + [f"{self.current.get(n, 0.0) * 1000:.4f}" for n in SECTIONS]
+                + [f"{frame * 1000:.4f}"]
+            )
+        self.frame_index += 1
+        self.current.clear()
+
+    def percentiles(self, name, qs=(0.50, 0.95, 0.99)):
+        data = sorted(self.samples[name])
+        if not data:
+            return tuple(0.0 for _ in qs)
+        last = len(data) - 1
+        return tuple(data[min(last, int(q * last + 0.5))] * 1000 for q in qs)
+
+    # -----------------------------------------------------
+    # Controls
+    # -----------------------------------------------------
+    def _update_enabled(self):
+        self.enabled = self.visible or self.csv_writer is not None
+        if not self.enabled:
+            self.frame_start = None
+            self.current.clear()
+
+    def toggle_overlay(self):
+        self.visible = not self.visible
+        self.panel = None
+        self._update_enabled()
+
+    def start_csv(self, path=PROFILER_CSV_PATH):
+        self.stop_csv()
+        self.csv_path = path
+        self.csv_file = open(path, "w", newline="")
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_writer.writerow(["frame"] + [f"{n}_ms" for n in SECTIONS] + ["frame_ms"])
+        self.panel = None
+        self._update_enabled()
+
+    def stop_csv(self):
+        if self.csv_file:
+            self.csv_file.close()
+            print(f"Saved frame profile to {self.csv_path}")
+        self.csv_file = None
+        self.csv_writer = None
+        self.panel = None
+        self._update_enabled()
+
+    def toggle_csv(self, path=PROFILER_CSV_PATH):
+        if self.csv_writer:
+            self.stop_csv()
+        else:
+            self.start_csv(path)
+
+    # -----------------------------------------------------
+    # Overlay
+    # -----------------------------------------------------
+    def build_panel(self):
+        names = SECTIONS + ("frame",)
+        line_h = 16
+        rows = len(names) + 1 + (1 if self.csv_writer else 0)
+        panel = pygame.Surface((300, 10 + line_h * rows))
+        panel.set_alpha(200)
+        panel.fill((0, 0, 0))
+
+        col = (120, 255, 120)
+        cols_x = (140, 190, 240)
+        for x, label in zip(cols_x, ("p50", "p95", "p99")):
+            panel.blit(render_text(label, 18, col), (x, 5))
+        panel.blit(render_text("ms", 18, col), (8, 5))
+
+        for i, name in enumerate(names, start=1):
+            y = 5 + i * line_h
+            panel.blit(render_text(name, 18, col), (8, y))
+            for x, v in zip(cols_x, self.percentiles(name)):
+                panel.blit(render_text(f"{v:.2f}", 18, col), (x, y))
+
+        if self.csv_writer:
+            panel.blit(render_text(f"CSV -> {self.csv_path}", 18, col), (8, 5 + (rows - 1) * line_h))
+        return panel
+
+    def draw(self, screen):
+        if not self.visible:
+            return None
+        # numbers only need to be readable: rebuild a few times per second
+        if self.panel is None or self.frame_index - self.panel_frame >= PANEL_REFRESH_FRAMES:
+            self.panel = self.build_panel()
+            self.panel_frame = self.frame_index
+        return screen.blit(self.panel, (12, 12))
+
+
+profiler = FrameProfiler()
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import random
+
+import pygame
+
+from game.config import TICK_RATE, MAX_CATCHUP_STEPS
+from game.mapfile import grid_bytes
+from game.streaming import StreamingWorld
+
+# Session recordings: everything the simulation consumes from the outside
+# world, so a run can be played back frame for frame.
+#
+# File format (JSON lines):
+#   line 1:  {"format": "pbrec", "version": 1, "seed": ..., "tick_rate": ..., "max_steps": ...}
+#   then one line per frame:  [frame_dt] or [frame_dt, [[type, key], ...]]
+#
+# Only events the game reacts to are stored; held keys are rebuilt from
+# KEYDOWN/KEYUP by loop.KeyState, and all randomness comes from the global
+# `random` module seeded with `seed`.
+
+FORMAT = "pbrec"
+VERSION = 1
+
+RECORDED_EVENTS = {
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.WINDOWFOCUSLOST,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+}
+
+
+def encode_events(events):
+    return [[e.type, getattr(e, "key", 0)] for e in events if e.type in RECORDED_EVENTS]
+
+
+def decode_events(data):
+    return [pygame.event.Event(t, key=k) for t, k in data]
+
+
+class Recorder:
+    def __init__(self, path, seed, tick_rate=TICK_RATE, max_steps=MAX_CATCHUP_STEPS):
+        self.path = path
+        self.file = open(path, "w")
+        self.frames = 0
+        header = {"format": FORMAT, "version": VERSION, "seed": seed,
+                  "tick_rate": tick_rate, "max_steps": max_steps}
+        self.file.write(json.dumps(header) + "\n")
+
+    def frame(self, frame_dt, events):
+        data = encode_events(events)
+        row = [frame_dt, data] if data else [frame_dt]
+        self.file.write(json.dumps(row, separators=(",", ":")) + "\n")
+        self.frames += 1
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            print(f"Recorded {self.frames} frames to {self.path}")
+
+
+class Recording:
+    def __init__(self, header, frames):
+        self.seed = header["seed"]
+        self.tick_rate = header.get("tick_rate", TICK_RATE)
+        self.max_steps = header.get("max_steps", MAX_CATCHUP_STEPS)
+        self.frames = frames   # [(frame_dt, events), ...]
+
+    @property
+    def duration(self):
+        return sum(dt for dt, _ in self.frames)
+
+
+def load_recording(path):
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path}: not a session recording")
+        if header.get("version") != VERSION:
+            raise ValueError(f"{path}: unsupported recording version {header.get('version')}")
+        frames = []
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                frames.append((row[0], decode_events(row[1]) if len(row) > 1 else []))
+    return Recording(header, frames)
+
+
+def world_state(world):
+    if isinstance(world, StreamingWorld):
+        # unedited regions come straight from disk: the edits are the state
+        return sorted((k, sorted(v.items())) for k, v in world.edits.items())
+    return grid_bytes(world)
+
+
+def state_hash(overworld):
+    """Digest of the simulation state; equal hashes mean equal runs."""
+    inv = overworld.inventory
+    battle = overworld.battle
+    state = (
+        overworld.mode, overworld.map_name,
+        overworld.player.x, overworld.player.y, overworld.player.dir,
+        overworld.popup_timer, overworld.encounter_cd, overworld.last_tile,
+        inv.potions, inv.capture_balls,
+        [(c.name, c.hp) for c in inv.party],
+        inv.party.index(inv.active) if inv.active in inv.party else None,
+        (battle.state, battle.enemy.name, battle.enemy.hp) if battle else None,
+        world_state(overworld.world),
+        sorted((name, sorted(e.items())) for name, e in overworld.maps.edits.items()),
+        random.getstate(),
+    )
+    return hashlib.sha256(repr(state).encode()).hexdigest()
@@ -0,0 +1,240 @@
+import array
+import os
+import queue
+import struct
+import sys
+import threading
+
+from game.mapfile import load_grid
+
+# Save files (.pbsave), little-endian:
+#
+#   magic "PBSV", version u16, journal generation u32 (version 2+)
+#   map name (str), player x/y (f64), facing (str)
+#   potions u16, capture balls u16, active index i16 (-1 = none)
+#   party count u16, then per creature: species name (str), hp i16
+#   map count u16, then per map: name (str), cell count u32,
+#       x[] u32, y[] u32, tile[] u16
+#
+# Strings are a u16 byte length + UTF-8. Only cells that differ from the
+# map file on disk are stored, so a save stays small however big the world.
+# Changes made after the snapshot live in journals (game.journal) numbered
+# from `generation` up.
+
+MAGIC = b"PBSV"
+VERSION = 2
+
+
+class SaveData:
+    def __init__(self, map_name, x, y, facing, potions, capture_balls, active, party, edits,
+                 generation=0):
+        self.map_name = map_name
+        self.x = x
+        self.y = y
+        self.facing = facing
+        self.potions = potions
+        self.capture_balls = capture_balls
+        self.active = active     # index into party, or -1
+        self.party = party       # [(species name, hp)]
+        self.edits = edits       # map name -> {(tx, ty): tid}
+        self.generation = generation
+
+
+def party_state(inv):
+    """(active index or -1, [(species name, hp)])."""
+    active = inv.party.index(inv.active) if inv.active in inv.party else -1
+    return active, [(c.name, c.hp) for c in inv.party]
+
+
+def snapshot(overworld, generation=0):
+    """Copy the state to save; cheap, so it can run on the main thread."""
+    inv = overworld.inventory
+    return SaveData(
+        overworld.map_name or overworld.graph.start[0],
+        overworld.player.x, overworld.player.y, overworld.player.dir,
+        inv.potions, inv.capture_balls,
+        *party_state(inv),
+        {name: dict(e) for name, e in overworld.maps.edits.items() if e},
+        generation,
+    )
+
+
+# ---------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------
+
+def pack_str(s):
+    b = s.encode()
+    return struct.pack("<H", len(b)) + b
+
+
+def _cells(values, code):
+    a = array.array(code, values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tobytes()
+
+
+def drop_unchanged(edits, graph):
+    """Edits minus cells that are back to their value in the map file."""
+    out = {}
+    for name, cells in edits.items():
+        info = graph.maps.get(name)
+        if info is not None and os.path.isfile(info.path):
+            source = load_grid(info.path)   # fresh mapping: no in-memory edits
+            cells = {k: t for k, t in cells.items() if source[k[1]][k[0]] != t}
+        if cells:
+            out[name] = cells
+    return out
+
+
+def encode_save(data):
+    parts = [
+        struct.pack("<4sHI", MAGIC, VERSION, data.generation),
+        pack_str(data.map_name),
+        struct.pack("<dd", data.x, data.y),
+        pack_str(data.facing),
+        struct.pack("<HHhH", data.potions, data.capture_balls, data.active, len(data.party)),
+    ]
+    for name, hp in data.party:
+        parts.append(pack_str(name) + struct.pack("<h", hp))
+
+    parts.append(struct.pack("<H", len(data.edits)))
+    for name, cells in data.edits.items():
+        keys = list(cells)
+        parts.append(pack_str(name) + struct.pack("<I", len(keys)))
+        parts.append(_cells((k[0] for k in keys), "I"))
+        parts.append(_cells((k[1] for k in keys), "I"))
+        parts.append(_cells((cells[k] for k in keys), "H"))
+    return b"".join(parts)
+
+
+class Reader:
+    def __init__(self, buf):
+        self.buf = memoryview(buf)
+        self.pos = 0
+
+    def unpack(self, fmt):
+        vals = struct.unpack_from(fmt, self.buf, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return vals
+
+    def str(self):
+        (n,) = self.unpack("<H")
+        s = bytes(self.buf[self.pos:self.pos + n]).decode()
+        self.pos += n
+        return s
+
+    def cells(self, code, count):
+        a = array.array(code)
+        n = a.itemsize * count
+        a.frombytes(self.buf[self.pos:self.pos + n])
+        if sys.byteorder != "little":
+            a.byteswap()
+        self.pos += n
+        return a
+
+
+def decode_save(buf):
+    r = Reader(buf)
+    try:
+        magic, version = r.unpack("<4sH")
+        if magic != MAGIC:
+            raise ValueError("not a save file")
+        if version not in (1, VERSION):
+            raise ValueError(f"unsupported save version {version}")
+        generation = r.unpack("<I")[0] if version >= 2 else 0
+
+        map_name = r.str()
+        x, y = r.unpack("<dd")
+        facing = r.str()
+        potions, balls, active, count = r.unpack("<HHhH")
+        party = []
+        for _ in range(count):
+            name = r.str()
+            party.append((name, r.unpack("<h")[0]))
+
+        edits = {}
+        for _ in range(r.unpack("<H")[0]):
+            name = r.str()
+            (n,) = r.unpack("<I")
+            xs, ys, tids = r.cells("I", n), r.cells("I", n), r.cells("H", n)
+            edits[name] = dict(zip(zip(xs, ys), tids))
+    except struct.error:
+        raise ValueError("truncated save file")
+    return SaveData(map_name, x, y, facing, potions, balls, active, party, edits, generation)
+
+
+def read_save(path):
+    with open(path, "rb") as f:
+        return decode_save(f.read())
+
+
+def write_atomic(path, payload):
+    # temp file + fsync + rename: a crash leaves the old save or the new one
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------
+# Background writer
+# ---------------------------------------------------------
+
+class SaveWriter:
+    """Encodes and writes snapshots on a worker thread.
+
+    Saves that pile up while one is being written collapse into the newest,
+    so saving often never queues work.
+    """
+
+    def __init__(self, path, graph, on_saved=None):
+        self.path = path
+        self.graph = graph
+        self.on_saved = on_saved   # called on the worker after each write
+        self.latest = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.errors = queue.Queue()
+        self.thread = threading.Thread(target=self._worker, name="save-writer", daemon=True)
+        self.thread.start()
+
+    def save(self, data):
+        with self.lock:
+            self.latest = data
+            self.idle.clear()
+        self.wake.set()
+
+    def _worker(self):
+        while True:
+            self.wake.wait()
+            with self.lock:
+                data, self.latest = self.latest, None
+                self.wake.clear()
+            if data is not None:
+                try:
+                    data.edits = drop_unchanged(data.edits, self.graph)
+                    write_atomic(self.path, encode_save(data))
+                    if self.on_saved:
+                        self.on_saved(data)
+                except Exception as e:
+                    self.errors.put(e)
+            with self.lock:
+                if self.latest is None:
+                    self.idle.set()
+
+    def wait(self, timeout=None):
+        """Block until everything handed to save() is on disk."""
+        return self.idle.wait(timeout)
+
+    def check(self):
+        """Re-raise a failed background write on the calling thread."""
+        try:
+            raise self.errors.get_nowait()
+        except queue.Empty:
+            pass
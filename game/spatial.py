@@ -0,0 +1,113 @@
+from game.config import SPATIAL_CELL_TILES
+
+# Uniform-grid spatial hash of objects on tiles (NPCs, signs, triggers...).
+#
+# Objects sit on one tile each. They are bucketed by SPATIAL_CELL_TILES-square
+# cell for area queries and also indexed by exact tile, so "what is on this
+# tile" is a single dict lookup. Buckets are insertion-ordered dicts rather
+# than sets, so iteration order, and with it replays, is deterministic.
+#
+# `version` is bumped on every change; the overworld folds it into its
+# redraw key. `on_move(obj, old, new)`, if set, hears about every change
+# (old/new are tiles, None on insert/remove); the path service uses it to
+# keep solid entities out of NPC paths.
+
+
+class SpatialHash:
+    def __init__(self, cell=SPATIAL_CELL_TILES):
+        self.cell = cell
+        self.buckets = {}   # (cx, cy) -> {obj: None}
+        self.tiles = {}     # (tx, ty) -> [obj]
+        self.pos = {}       # obj -> (tx, ty)
+        self.version = 0
+        self.on_move = None
+
+    def __len__(self):
+        return len(self.pos)
+
+    def __iter__(self):
+        return iter(self.pos)
+
+    def __contains__(self, obj):
+        return obj in self.pos
+
+    # -----------------------------------------------------
+    # Changes
+    # -----------------------------------------------------
+    def _add(self, obj, tx, ty):
+        c = self.cell
+        self.pos[obj] = (tx, ty)
+        self.tiles.setdefault((tx, ty), []).append(obj)
+        self.buckets.setdefault((tx // c, ty // c), {})[obj] = None
+
+    def _discard(self, obj):
+        c = self.cell
+        tx, ty = self.pos.pop(obj)
+        on_tile = self.tiles[(tx, ty)]
+        on_tile.remove(obj)
+        if not on_tile:
+            del self.tiles[(tx, ty)]
+        bucket = self.buckets[(tx // c, ty // c)]
+        del bucket[obj]
+        if not bucket:
+            del self.buckets[(tx // c, ty // c)]
+
+    def insert(self, obj, tx, ty):
+        if obj in self.pos:
+            raise ValueError(f"{obj!r} is already placed")
+        self._add(obj, tx, ty)
+        self.version += 1
+        if self.on_move:
+            self.on_move(obj, None, (tx, ty))
+
+    def remove(self, obj):
+        old = self.pos[obj]
+        self._discard(obj)
+        self.version += 1
+        if self.on_move:
+            self.on_move(obj, old, None)
+
+    def move(self, obj, tx, ty):
+        old = self.pos[obj]
+        if old == (tx, ty):
+            return
+        self._discard(obj)
+        self._add(obj, tx, ty)
+        self.version += 1
+        if self.on_move:
+            self.on_move(obj, old, (tx, ty))
+
+    # -----------------------------------------------------
+    # Queries
+    # -----------------------------------------------------
+    def position(self, obj):
+        return self.pos[obj]
+
+    def at(self, tx, ty):
+        """Objects on one tile (empty tuple when none)."""
+        return self.tiles.get((tx, ty), ())
+
+    def in_rect(self, x0, y0, x1, y1):
+        """Objects on tiles x0 <= tx < x1, y0 <= ty < y1."""
+        c = self.cell
+        out = []
+        if x1 <= x0 or y1 <= y0:
+            return out
+        pos = self.pos
+        for cy in range(y0 // c, (y1 - 1) // c + 1):
+            for cx in range(x0 // c, (x1 - 1) // c + 1):
+                bucket = self.buckets.get((cx, cy))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    tx, ty = pos[obj]
+                    if x0 <= tx < x1 and y0 <= ty < y1:
+                        out.append(obj)
+        return out
+
+    def near(self, tx, ty, radius):
+        """Objects within `radius` tiles (straight-line) of (tx, ty)."""
+        r2 = radius * radius
+        pos = self.pos
+        return [o for o in self.in_rect(tx - radius, ty - radius, tx + radius + 1, ty + radius + 1)
+                if (pos[o][0] - tx) ** 2 + (pos[o][1] - ty) ** 2 <= r2]
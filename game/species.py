@@ -0,0 +1,149 @@
+import json
+import random
+
+from game.config import SPECIES_PATH
+
+# Species data is plain data (no pygame) so tools and the headless battle
+# engine can load it without a display.
+
+STAT_KEYS = ("hp", "atk", "dfn", "spd")
+
+
+class Species:
+    __slots__ = ("name", "hp", "atk", "dfn", "spd", "sprite", "moves", "encounter_weight")
+
+    def __init__(self, name, hp, atk, dfn, spd, sprite, moves, encounter_weight=0):
+        self.name = name
+        self.hp = hp
+        self.atk = atk
+        self.dfn = dfn
+        self.spd = spd
+        self.sprite = sprite
+        self.moves = moves   # tuple of {"name": str, "power": int}, shared by all instances
+        self.encounter_weight = encounter_weight
+
+    def __repr__(self):
+        return f"Species({self.name!r})"
+
+
+class AliasTable:
+    """Walker alias table: O(1) weighted pick after O(n) setup."""
+
+    def __init__(self, items, weights):
+        n = len(items)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.items = list(items)
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def pick(self, rng=random):
+        i = int(rng.random() * len(self.items))
+        if rng.random() < self.prob[i]:
+            return self.items[i]
+        return self.items[self.alias[i]]
+
+
+class SpeciesTable:
+    def __init__(self, species, starter):
+        self.species = species                      # list in file order
+        self.by_name = {s.name: s for s in species}
+        self.starter = self.by_name[starter]
+
+        wild = [s for s in species if s.encounter_weight > 0]
+        self.encounters = AliasTable(wild, [s.encounter_weight for s in wild])
+
+    def __getitem__(self, name):
+        return self.by_name[name]
+
+    def pick_encounter(self, rng=random):
+        return self.encounters.pick(rng)
+
+
+# ---------------------------------------------------------
+# Loading + validation
+# ---------------------------------------------------------
+
+def _parse_species(entry, index):
+    where = f"species[{index}]"
+    if not isinstance(entry, dict):
+        raise ValueError(f"{where}: expected an object")
+
+    name = entry.get("name")
+    if not isinstance(name, str) or not name:
+        raise ValueError(f"{where}: missing name")
+    where = f"species {name!r}"
+
+    stats = {}
+    for k in STAT_KEYS:
+        v = entry.get(k)
+        if not isinstance(v, int) or isinstance(v, bool) or v <= 0:
+            raise ValueError(f"{where}: {k} must be a positive integer")
+        stats[k] = v
+
+    sprite = entry.get("sprite")
+    if not isinstance(sprite, str) or not sprite:
+        raise ValueError(f"{where}: missing sprite")
+
+    moves = entry.get("moves")
+    if not isinstance(moves, list) or not moves:
+        raise ValueError(f"{where}: needs at least one move")
+    parsed = []
+    for m in moves:
+        if (not isinstance(m, dict) or not isinstance(m.get("name"), str)
+                or not isinstance(m.get("power"), int) or m["power"] < 0):
+            raise ValueError(f"{where}: bad move {m!r}")
+        parsed.append({"name": m["name"], "power": m["power"]})
+
+    weight = entry.get("encounter_weight", 0)
+    if not isinstance(weight, (int, float)) or weight < 0:
+        raise ValueError(f"{where}: encounter_weight must be >= 0")
+
+    return Species(name, stats["hp"], stats["atk"], stats["dfn"], stats["spd"],
+                   sprite, tuple(parsed), weight)
+
+
+def parse_species_table(data):
+    entries = data.get("species") if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("species table: 'species' must be a non-empty list")
+
+    species = [_parse_species(e, i) for i, e in enumerate(entries)]
+
+    names = [s.name for s in species]
+    if len(set(names)) != len(names):
+        raise ValueError("species table: duplicate species names")
+
+    starter = data.get("starter")
+    if starter not in names:
+        raise ValueError(f"species table: unknown starter {starter!r}")
+    if not any(s.encounter_weight > 0 for s in species):
+        raise ValueError("species table: no species has encounter_weight > 0")
+
+    return SpeciesTable(species, starter)
+
+
+_table = None
+
+
+def load_species_table(path=SPECIES_PATH):
+    global _table
+    with open(path) as f:
+        _table = parse_species_table(json.load(f))
+    return _table
+
+
+def species_table():
+    if _table is None:
+        load_species_table()
+    return _table
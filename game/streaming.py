@@ -0,0 +1,197 @@
+import json
+import os
+from collections import OrderedDict
+
+from game.config import REGION_CACHE_BYTES, REGION_PRELOAD_RADIUS
+from game.loader import BackgroundLoader
+from game.mapfile import read_map
+from game.tileflags import BLOCKING
+
+# Region-streamed world for maps too big to hold at once.
+#
+# A region directory (see tools.convert_map --regions) holds:
+#   regions.json     {"width": W, "height": H, "region_tiles": R, "fill": tile_id}
+#   <rx>_<ry>.pbmap  one R x R block of tiles (edge regions may be smaller;
+#                    missing files are solid `fill`)
+#
+# Regions near the player are loaded on a background thread and installed on
+# the main thread in update(); the least recently needed ones are dropped
+# once the byte budget is exceeded. Edits are kept per region and re-applied
+# whenever that region is loaded again.
+#
+# StreamingWorld looks like the usual world[y][x] grid. A cell whose region
+# is not loaded yet reads as None: it draws as black and blocks movement.
+
+
+class Region:
+    __slots__ = ("w", "h", "cells", "flags")
+
+    def __init__(self, w, h, cells, flags):
+        self.w = w
+        self.h = h
+        self.cells = cells   # flat uint16 (memoryview or list), row-major
+        self.flags = flags   # bytearray, one flag byte per cell
+
+    @property
+    def nbytes(self):
+        return self.w * self.h * 3
+
+
+class _Row:
+    __slots__ = ("world", "y")
+
+    def __init__(self, world, y):
+        self.world = world
+        self.y = y
+
+    def __len__(self):
+        return self.world.width
+
+    def __getitem__(self, x):
+        return self.world.tile(x, self.y)
+
+    def __setitem__(self, x, tid):
+        self.world.set_tile(x, self.y, tid)
+
+
+class RegionFlags:
+    """FlagGrid interface over the loaded regions."""
+
+    def __init__(self, world):
+        self.world = world
+
+    def at(self, tx, ty):
+        """Flags at a cell, or None when out of bounds or not loaded."""
+        w = self.world
+        if tx < 0 or ty < 0 or tx >= w.width or ty >= w.height:
+            return None
+        n = w.region_tiles
+        region = w.regions.get((tx // n, ty // n))
+        if region is None:
+            return None
+        return region.flags[(ty % n) * region.w + tx % n]
+
+    def set_tile(self, tx, ty, tid):
+        pass   # StreamingWorld.set_tile keeps region flags in step
+
+    def is_blocked(self, tx, ty):
+        f = self.at(tx, ty)
+        return f is None or f & BLOCKING != 0
+
+
+class StreamingWorld:
+    def __init__(self, path, tile_flags, budget=REGION_CACHE_BYTES, radius=REGION_PRELOAD_RADIUS):
+        with open(os.path.join(path, "regions.json")) as f:
+            meta = json.load(f)
+        self.path = path
+        self.width = meta["width"]
+        self.height = meta["height"]
+        self.region_tiles = meta["region_tiles"]
+        self.fill = meta.get("fill", 0)
+        self.tile_flags = tile_flags
+        self.budget = budget
+        self.radius = radius
+
+        self.regions = OrderedDict()   # (rx, ry) -> Region, LRU order
+        self.edits = {}                # (rx, ry) -> {(tx, ty): tid}
+        self.flags = RegionFlags(self)
+        self.loader = BackgroundLoader(self._read_region, "region-loader")
+
+    # -----------------------------------------------------
+    # Grid interface
+    # -----------------------------------------------------
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        return _Row(self, y)
+
+    def tile(self, tx, ty):
+        n = self.region_tiles
+        region = self.regions.get((tx // n, ty // n))
+        if region is None:
+            return None
+        return region.cells[(ty % n) * region.w + tx % n]
+
+    def set_tile(self, tx, ty, tid):
+        n = self.region_tiles
+        key = (tx // n, ty // n)
+        self.edits.setdefault(key, {})[(tx, ty)] = tid
+        region = self.regions.get(key)
+        if region is not None:
+            i = (ty % n) * region.w + tx % n
+            region.cells[i] = tid
+            region.flags[i] = self.tile_flags[tid]
+
+    def region_bounds(self, key):
+        n = self.region_tiles
+        x0, y0 = key[0] * n, key[1] * n
+        return x0, y0, min(x0 + n, self.width), min(y0 + n, self.height)
+
+    # -----------------------------------------------------
+    # Loading
+    # -----------------------------------------------------
+    def _read_region(self, key):
+        # worker thread: touch every page here so the main thread never faults
+        x0, y0, x1, y1 = self.region_bounds(key)
+        w, h = x1 - x0, y1 - y0
+        path = os.path.join(self.path, f"{key[0]}_{key[1]}.pbmap")
+        if os.path.exists(path):
+            data = read_map(path)
+            if (data.width, data.height) != (w, h):
+                raise ValueError(f"{path}: expected {w}x{h}, got {data.width}x{data.height}")
+            cells = data.cells[:w * h]
+        else:
+            cells = [self.fill] * (w * h)
+        flags = bytearray(self.tile_flags[t] for t in cells)
+        return Region(w, h, cells, flags)
+
+    def _install(self, key, region):
+        n = self.region_tiles
+        for (tx, ty), tid in self.edits.get(key, {}).items():
+            i = (ty % n) * region.w + tx % n
+            region.cells[i] = tid
+            region.flags[i] = self.tile_flags[tid]
+        self.regions[key] = region
+
+    def wanted(self, tx, ty):
+        """Regions within `radius` of the one containing (tx, ty), nearest first."""
+        n, r = self.region_tiles, self.radius
+        cx, cy = tx // n, ty // n
+        cols = (self.width + n - 1) // n
+        rows = (self.height + n - 1) // n
+        keys = [(x, y) for y in range(max(0, cy - r), min(rows, cy + r + 1))
+                for x in range(max(0, cx - r), min(cols, cx + r + 1))]
+        keys.sort(key=lambda k: abs(k[0] - cx) + abs(k[1] - cy))
+        return keys
+
+    def update(self, tx, ty, wait=False):
+        """Stream around tile (tx, ty); returns bounds of newly loaded regions.
+
+        Call from the main thread once per tick. With wait=True, blocks until
+        every wanted region is in (used at startup and after teleports).
+        """
+        wanted = self.wanted(tx, ty)
+        for key in wanted:
+            if key in self.regions:
+                self.regions.move_to_end(key)
+            else:
+                self.loader.request(key)
+
+        loaded = []
+        for key, region in self.loader.poll(wait):
+            self._install(key, region)
+            loaded.append(self.region_bounds(key))
+
+        # evict least recently wanted regions over budget (never the wanted ones)
+        keep = set(wanted)
+        used = sum(r.nbytes for r in self.regions.values())
+        for key in list(self.regions):
+            if used <= self.budget:
+                break
+            if key not in keep:
+                used -= self.regions.pop(key).nbytes
+        return loaded
+
+    def close(self):
+        self.loader.close()
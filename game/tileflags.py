@@ -0,0 +1,61 @@
+from game.config import (
+    BLOCKING_TILES, ENCOUNTER_TILES, SIGN_TILE,
+    CAPTURE_BALL_TILE, POTION_TILE,
+)
+
+# Per-tile-ID property bits
+BLOCKING = 1
+ENCOUNTER = 2
+SIGN = 4
+PICKUP = 8
+
+
+def build_tile_flags(num_tiles):
+    """Flag byte per tile ID, built once when the tileset loads."""
+    ids = set(BLOCKING_TILES) | set(ENCOUNTER_TILES) | {SIGN_TILE, POTION_TILE, CAPTURE_BALL_TILE}
+    flags = bytearray(max(num_tiles, max(ids) + 1))
+    for tid in BLOCKING_TILES:
+        flags[tid] |= BLOCKING
+    for tid in ENCOUNTER_TILES:
+        flags[tid] |= ENCOUNTER
+    flags[SIGN_TILE] |= SIGN
+    flags[POTION_TILE] |= PICKUP
+    flags[CAPTURE_BALL_TILE] |= PICKUP
+    return flags
+
+
+class FlagGrid:
+    """Per-cell tile flags for one map, kept parallel to the tile grid."""
+
+    def __init__(self, world, tile_flags):
+        self.tile_flags = tile_flags
+        self.w = len(world[0]) if world else 0
+        self.h = len(world)
+        self.cells = bytearray(self.w * self.h)
+        for y, row in enumerate(world):
+            self.cells[y * self.w:(y + 1) * self.w] = bytes(tile_flags[t] for t in row)
+
+    def at(self, tx, ty):
+        """Flags at a cell, or None when out of bounds."""
+        if tx < 0 or ty < 0 or tx >= self.w or ty >= self.h:
+            return None
+        return self.cells[ty * self.w + tx]
+
+    def set_tile(self, tx, ty, tid):
+        self.cells[ty * self.w + tx] = self.tile_flags[tid]
+
+    def is_blocked(self, tx, ty):
+        # out of bounds counts as blocked
+        if tx < 0 or ty < 0 or tx >= self.w or ty >= self.h:
+            return True
+        return self.cells[ty * self.w + tx] & BLOCKING != 0
+
+    def mask(self, bits):
+        """Bytes with 1 where any of bits is set, 0 elsewhere (row-major)."""
+        table = bytes(1 if f & bits else 0 for f in range(256))
+        return self.cells.translate(table)
+
+    def walkable(self):
+        """Bytes with 1 for every walkable cell (row-major, w * h)."""
+        table = bytes(0 if f & BLOCKING else 1 for f in range(256))
+        return self.cells.translate(table)
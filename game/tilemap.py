@@ -0,0 +1,101 @@
+import pygame
+from collections import OrderedDict
+
+from game.config import CHUNK_TILES, CHUNK_CACHE_SIZE
+
+
+class ChunkCache:
+    """Map pre-rendered into fixed-size chunk surfaces.
+
+    A frame only blits the chunks overlapping the camera. A chunk is
+    rebuilt when a tile inside it changes (see invalidate_tile) or when it
+    was evicted to keep memory bounded on big maps.
+    """
+
+    def __init__(self, world, tiles, tile_px, chunk_tiles=CHUNK_TILES, max_chunks=CHUNK_CACHE_SIZE):
+        self.world = world
+        self.tiles = tiles
+        self.tile_px = tile_px
+        self.chunk_tiles = chunk_tiles
+        self.chunk_px = tile_px * chunk_tiles
+        self.max_chunks = max_chunks
+
+        self.chunks = OrderedDict()   # (cx, cy) -> Surface, LRU order
+        self.dirty = set()
+
+    # -----------------------------------------------------
+    # Invalidation
+    # -----------------------------------------------------
+    def invalidate_tile(self, tx, ty):
+        key = (tx // self.chunk_tiles, ty // self.chunk_tiles)
+        if key in self.chunks:
+            self.dirty.add(key)
+
+    def invalidate_area(self, x0, y0, x1, y1):
+        # tiles [x0, x1) x [y0, y1)
+        n = self.chunk_tiles
+        for cy in range(y0 // n, (y1 - 1) // n + 1):
+            for cx in range(x0 // n, (x1 - 1) // n + 1):
+                if (cx, cy) in self.chunks:
+                    self.dirty.add((cx, cy))
+
+    def invalidate_all(self):
+        self.chunks.clear()
+        self.dirty.clear()
+
+    # -----------------------------------------------------
+    # Building
+    # -----------------------------------------------------
+    def build_chunk(self, cx, cy):
+        n = self.chunk_tiles
+        x0, y0 = cx * n, cy * n
+        x1 = min(x0 + n, len(self.world[0]))
+        y1 = min(y0 + n, len(self.world))
+
+        surf = self.chunks.get((cx, cy))
+        size = ((x1 - x0) * self.tile_px, (y1 - y0) * self.tile_px)
+        if surf is None or surf.get_size() != size:
+            surf = pygame.Surface(size).convert()
+        surf.fill((0, 0, 0))
+
+        tiles = self.tiles
+        tp = self.tile_px
+        world = self.world
+        # None = not loaded yet (streamed maps): left black until it arrives
+        surf.blits(
+            [(tiles[t], ((x - x0) * tp, (y - y0) * tp))
+             for y in range(y0, y1) for x in range(x0, x1)
+             if (t := world[y][x]) is not None],
+            False
+        )
+        return surf
+
+    def get_chunk(self, cx, cy):
+        key = (cx, cy)
+        surf = self.chunks.get(key)
+        if surf is None or key in self.dirty:
+            surf = self.build_chunk(cx, cy)
+            self.chunks[key] = surf
+            self.dirty.discard(key)
+            while len(self.chunks) > self.max_chunks:
+                old, _ = self.chunks.popitem(last=False)
+                self.dirty.discard(old)
+        self.chunks.move_to_end(key)
+        return surf
+
+    # -----------------------------------------------------
+    # Draw
+    # -----------------------------------------------------
+    def draw(self, screen, camx, camy, view_w, view_h):
+        cp = self.chunk_px
+        cols = (len(self.world[0]) + self.chunk_tiles - 1) // self.chunk_tiles
+        rows = (len(self.world) + self.chunk_tiles - 1) // self.chunk_tiles
+
+        start_x = max(0, camx // cp)
+        start_y = max(0, camy // cp)
+        end_x = min(cols, (camx + view_w - 1) // cp + 1)
+        end_y = min(rows, (camy + view_h - 1) // cp + 1)
+
+        for cy in range(start_y, end_y):
+            for cx in range(start_x, end_x):
+                screen.blit(self.get_chunk(cx, cy), (cx * cp - camx, cy * cp - camy))
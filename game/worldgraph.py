@@ -0,0 +1,229 @@
+import json
+import os
+from collections import OrderedDict
+
+from game.config import MAP_CACHE_BYTES
+from game.entities import parse_entity, spawn_entities
+from game.loader import BackgroundLoader
+from game.mapfile import load_grid
+from game.pathfinding import PathService
+from game.streaming import StreamingWorld
+from game.tileflags import FlagGrid
+from game.tilemap import ChunkCache
+
+# The world is a graph of maps (assets/maps/world.json):
+#
+#   {
+#     "start": {"map": "route1", "x": 5, "y": 10},
+#     "maps": {
+#       "route1": {
+#         "path": "route1.pbmap",                       # or a region directory
+#         "edges": {"east": "route2",                   # walk off an edge...
+#                   "north": {"map": "cave", "offset": -4}},   # ...shifted by offset tiles
+#         "warps": [{"x": 3, "y": 4, "map": "house", "tx": 2, "ty": 6}],
+#         "entities": [{"kind": "sign", "x": 7, "y": 3, "text": "..."}]   # game.entities
+#       }
+#     }
+#   }
+#
+# MapCache keeps recently visited maps resident (grid, flags and rendered
+# chunks) within MAP_CACHE_BYTES and preloads neighbours in the background,
+# so a transition only swaps references. Entities start from world.json
+# each time a map is loaded.
+
+SIDES = ("north", "south", "west", "east")
+
+
+class Warp:
+    __slots__ = ("map", "tx", "ty")
+
+    def __init__(self, map, tx, ty):
+        self.map = map
+        self.tx = tx
+        self.ty = ty
+
+
+class MapInfo:
+    def __init__(self, name, path, edges, warps, entities=()):
+        self.name = name
+        self.path = path
+        self.edges = edges         # side -> (map name, offset in tiles)
+        self.warps = warps         # (x, y) -> Warp
+        self.entities = entities   # world.json entity entries
+
+    def exits(self):
+        """Every map reachable from this one."""
+        return {m for m, _ in self.edges.values()} | {w.map for w in self.warps.values()}
+
+
+class WorldGraph:
+    def __init__(self, maps, start):
+        self.maps = maps     # name -> MapInfo
+        self.start = start   # (map name, tx, ty)
+
+    def __getitem__(self, name):
+        return self.maps[name]
+
+
+def parse_world_graph(data, base_dir=""):
+    maps = {}
+    for name, entry in data["maps"].items():
+        edges = {}
+        for side, target in entry.get("edges", {}).items():
+            if side not in SIDES:
+                raise ValueError(f"map {name!r}: unknown edge {side!r}")
+            if isinstance(target, str):
+                target = {"map": target}
+            edges[side] = (target["map"], int(target.get("offset", 0)))
+        warps = {(int(w["x"]), int(w["y"])): Warp(w["map"], int(w["tx"]), int(w["ty"]))
+                 for w in entry.get("warps", [])}
+        entities = entry.get("entities", [])
+        for spec in entities:
+            try:
+                parse_entity(spec)   # fail here rather than on the first visit
+            except ValueError as e:
+                raise ValueError(f"map {name!r}: {e}")
+        maps[name] = MapInfo(name, os.path.join(base_dir, entry["path"]), edges, warps, entities)
+
+    for info in maps.values():
+        for target in info.exits():
+            if target not in maps:
+                raise ValueError(f"map {info.name!r} leads to unknown map {target!r}")
+
+    start = data["start"]
+    if start["map"] not in maps:
+        raise ValueError(f"unknown start map {start['map']!r}")
+    return WorldGraph(maps, (start["map"], int(start["x"]), int(start["y"])))
+
+
+def load_world_graph(path):
+    with open(path) as f:
+        return parse_world_graph(json.load(f), os.path.dirname(path))
+
+
+class LoadedMap:
+    __slots__ = ("name", "grid", "flags", "chunks", "entities", "paths")
+
+    def __init__(self, name, grid, flags, chunks=None, paths=None):
+        self.name = name
+        self.grid = grid
+        self.flags = flags
+        self.chunks = chunks
+        self.entities = None
+        self.paths = paths
+
+    @property
+    def streamed(self):
+        return isinstance(self.grid, StreamingWorld)
+
+    @property
+    def nbytes(self):
+        if self.streamed:
+            # only the regions in memory, which may be none yet
+            n = sum(r.nbytes for r in self.grid.regions.values())
+        else:
+            n = len(self.grid) * (len(self.grid[0]) if self.grid else 0) * 3
+        if self.paths:
+            n += 2 * len(self.paths.walk)   # walk + free
+        if self.chunks:
+            n += sum(s.get_width() * s.get_height() * 4 for s in self.chunks.chunks.values())
+        return n
+
+
+class MapCache:
+    def __init__(self, graph, tiles, tile_flags, tile_px, budget=MAP_CACHE_BYTES, sync=False):
+        self.graph = graph
+        self.tiles = tiles
+        self.tile_flags = tile_flags
+        self.tile_px = tile_px
+        self.budget = budget
+        self.sync = sync   # preload on the calling thread (recording/replay)
+
+        self.maps = OrderedDict()   # name -> LoadedMap, LRU order
+        self.edits = {}             # name -> {(tx, ty): tid}, survives eviction
+        self.current = None
+        self.loader = BackgroundLoader(self.load, "map-loader")
+
+    def load(self, name):
+        # no surfaces here: safe on the worker thread. Streamed maps get
+        # no path service, they are never all in memory.
+        info = self.graph[name]
+        if os.path.isdir(info.path):
+            grid = StreamingWorld(info.path, self.tile_flags)
+            m = LoadedMap(name, grid, grid.flags)
+            m.entities = spawn_entities(info.entities)
+            return m
+        grid = load_grid(info.path)
+        flags = FlagGrid(grid, self.tile_flags)
+        m = LoadedMap(name, grid, flags, paths=PathService(flags))
+        m.entities = spawn_entities(info.entities)
+        m.paths.watch(m.entities)
+        m.paths.label_all()
+        return m
+
+    def _apply_edits(self, m):
+        for (tx, ty), tid in self.edits.get(m.name, {}).items():
+            m.grid[ty][tx] = tid
+            m.flags.set_tile(tx, ty, tid)
+            if m.paths:
+                m.paths.tile_changed(tx, ty)
+            if m.chunks:
+                m.chunks.invalidate_tile(tx, ty)
+
+    def _install(self, m):
+        # main thread: re-apply edits, attach a chunk cache
+        self._apply_edits(m)
+        m.chunks = ChunkCache(m.grid, self.tiles, self.tile_px)
+        self.maps[m.name] = m
+
+    def get(self, name):
+        """The map, loading it right now if the preload has not finished."""
+        self.poll()
+        if name not in self.maps:
+            self._install(self.load(name))
+        self.current = name
+        self.maps.move_to_end(name)
+        self.evict()
+        return self.maps[name]
+
+    def preload(self, name):
+        if name in self.maps:
+            return
+        if self.sync:
+            self._install(self.load(name))
+            self.evict()
+        else:
+            self.loader.request(name)
+
+    def poll(self):
+        for name, m in self.loader.poll():
+            if name not in self.maps:
+                self._install(m)
+        self.evict()
+
+    def reset(self, edits):
+        """Replace every map's edits (loading a save)."""
+        for name in list(self.maps):
+            if self.edits.get(name):
+                # holds edits the save may not: start again from the file
+                m = self.maps.pop(name)
+                if m.streamed:
+                    m.grid.close()
+        self.edits = {name: dict(e) for name, e in edits.items()}
+        for m in self.maps.values():
+            self._apply_edits(m)
+
+    def record_edit(self, name, tx, ty, tid):
+        self.edits.setdefault(name, {})[(tx, ty)] = tid
+
+    def evict(self):
+        # edits live in self.edits, so any map but the current one can go
+        used = sum(m.nbytes for m in self.maps.values())
+        for name in list(self.maps):
+            if used <= self.budget:
+                break
+            if name != self.current:
+                m = self.maps.pop(name)
+                used -= m.nbytes
+                if m.streamed:
+                    m.grid.close()
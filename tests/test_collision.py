@@ -0,0 +1,50 @@
+from game.collision import move_box, sweep_x, sweep_y
+
+T = 32
+SIZE = 16   # box inside one tile
+
+
+def walls(*cells):
+    cells = set(cells)
+    return lambda tx, ty: (tx, ty) in cells
+
+
+def test_right_stops_at_wall():
+    x, hit = sweep_x(40, 40, SIZE, SIZE, 100, walls((3, 1)), T)
+    assert hit and x == 3 * T - SIZE
+
+
+def test_left_stops_at_wall():
+    x, hit = sweep_x(40, 40, SIZE, SIZE, -100, walls((-1, 1)), T)
+    assert hit and x == 0
+
+
+def test_down_stops_at_wall():
+    y, hit = sweep_y(40, 40, SIZE, SIZE, 100, walls((1, 3)), T)
+    assert hit and y == 3 * T - SIZE
+
+
+def test_up_stops_at_wall():
+    y, hit = sweep_y(40, 40, SIZE, SIZE, -100, walls((1, -1)), T)
+    assert hit and y == 0
+
+
+def test_no_tunnelling_through_thin_wall():
+    x, hit = sweep_x(40, 40, SIZE, SIZE, 10 * T, walls((2, 1)), T)
+    assert hit and x == 2 * T - SIZE
+
+
+def test_flush_against_wall_does_not_move():
+    assert sweep_x(T, 40, SIZE, SIZE, -5, walls((0, 1)), T) == (T, True)
+    assert sweep_y(40, T, SIZE, SIZE, -5, walls((1, 0)), T) == (T, True)
+
+
+def test_negative_sweep_ignores_cell_already_overlapped():
+    # the box's own cell is not "entered", so it cannot push the box back
+    assert sweep_x(40, 40, SIZE, SIZE, -4, walls((1, 1)), T) == (36, False)
+    assert sweep_y(40, 40, SIZE, SIZE, -4, walls((1, 1)), T) == (36, False)
+
+
+def test_diagonal_slides_along_wall():
+    x, y, hit_x, hit_y = move_box(40, 40, SIZE, SIZE, 50, 20, walls((2, 1), (2, 2)), T)
+    assert (x, y, hit_x, hit_y) == (2 * T - SIZE, 60, True, False)
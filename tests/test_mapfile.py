@@ -0,0 +1,56 @@
+import pytest
+
+from game.mapfile import (
+    grid_bytes, load_grid, read_csv_map, read_map, write_csv_map, write_map,
+)
+
+GROUND = [[0, 1, 2], [3, 4, 65535]]
+DECO = [[9, 9, 9], [0, 0, 7]]
+
+
+def test_pbmap_round_trip(tmp_path):
+    path = str(tmp_path / "m.pbmap")
+    write_map(path, [GROUND, DECO])
+    data = read_map(path)
+    assert (data.width, data.height, data.layers) == (3, 2, 2)
+    assert [list(r) for r in data.layer(0)] == GROUND
+    assert [list(r) for r in data.layer(1)] == DECO
+    assert [list(r) for r in load_grid(path, 1)] == DECO
+
+
+def test_grid_bytes_same_for_lists_and_mapped_rows(tmp_path):
+    path = str(tmp_path / "m.pbmap")
+    write_map(path, [GROUND])
+    assert grid_bytes(load_grid(path)) == grid_bytes(GROUND)
+
+
+def test_edits_stay_private(tmp_path):
+    path = str(tmp_path / "m.pbmap")
+    write_map(path, [GROUND])
+    grid = load_grid(path)
+    grid[0][0] = 42
+    assert load_grid(path)[0][0] == 0
+
+
+def test_csv_round_trip(tmp_path):
+    path = str(tmp_path / "m.csv")
+    write_csv_map(path, GROUND)
+    assert read_csv_map(path) == GROUND
+    assert load_grid(path) == GROUND
+
+
+def test_bad_files_are_rejected(tmp_path):
+    path = str(tmp_path / "m.pbmap")
+    with pytest.raises(ValueError):
+        write_map(path, [GROUND, [[1, 2]]])
+
+    write_map(path, [GROUND])
+    with open(path, "r+b") as f:
+        f.write(b"XXXX")
+    with pytest.raises(ValueError):
+        read_map(path)
+
+    with open(path, "wb") as f:
+        f.write(b"PB")
+    with pytest.raises(ValueError):
+        read_map(path)
@@ -0,0 +1,63 @@
+from game.config import BLOCKING_TILES
+from game.pathfinding import PathService
+from game.tileflags import FlagGrid, build_tile_flags
+
+WALL = min(BLOCKING_TILES)
+TILE_FLAGS = build_tile_flags(64)
+
+
+def service(rows):
+    # "#" is a wall, anything else floor
+    grid = [[WALL if c == "#" else 0 for c in row] for row in rows]
+    flags = FlagGrid(grid, TILE_FLAGS)
+    paths = PathService(flags)
+    paths.label_all()
+    return grid, flags, paths
+
+
+def set_tile(grid, flags, paths, tx, ty, tid):
+    grid[ty][tx] = tid
+    flags.set_tile(tx, ty, tid)
+    paths.tile_changed(tx, ty)
+
+
+def test_opened_joins_components():
+    grid, flags, paths = service(["...#...",
+                                  "...#..."])
+    c = paths.components
+    assert c.label(0, 0) == c.label(2, 1) != c.label(4, 0)
+    set_tile(grid, flags, paths, 3, 1, 0)
+    assert c.label(0, 0) == c.label(4, 0) == c.label(3, 1)
+    assert paths.reachable((0, 0), (6, 1))
+
+
+def test_opened_cell_without_neighbours():
+    grid, flags, paths = service(["###",
+                                  "###"])
+    set_tile(grid, flags, paths, 1, 0, 0)
+    assert paths.components.label(1, 0) is not None
+    assert paths.components.label(0, 0) is None
+
+
+def test_closed_splits_run_then_relabels():
+    grid, flags, paths = service(["......."])
+    set_tile(grid, flags, paths, 3, 0, WALL)
+    c = paths.components
+    assert c.label(3, 0) is None
+    # until the relabel, both halves may still share a label (never split wrongly)
+    assert c.label(0, 0) == c.label(6, 0)
+    assert paths.find((0, 0), (6, 0)) is None
+
+    paths.update()
+    c = paths.components
+    assert not paths.stale
+    assert c.label(0, 0) != c.label(6, 0)
+    assert not paths.reachable((0, 0), (6, 0))
+
+
+def test_path_goes_around_wall():
+    _, _, paths = service(["....",
+                           ".##.",
+                           "...."])
+    path = paths.find((0, 1), (3, 1))
+    assert path[-1] == (3, 1) and len(path) == 5
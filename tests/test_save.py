@@ -0,0 +1,70 @@
+import pytest
+
+from game.journal import (
+    Journal, frame, journal_path, items_record, location_record, party_record,
+    read_records, replay_journals, tile_record,
+)
+from game.save import SaveData, decode_save, encode_save, read_save, write_atomic
+
+
+def sample():
+    return SaveData("route1", 40.5, 96.25, "left", 3, 2, 1,
+                    [("Raccoon", 12), ("Python", 0)],
+                    {"route1": {(1, 2): 7, (300, 4): 65535}, "cave": {(0, 0): 1}},
+                    generation=4)
+
+
+def assert_same(a, b):
+    assert (a.map_name, a.x, a.y, a.facing) == (b.map_name, b.x, b.y, b.facing)
+    assert (a.potions, a.capture_balls, a.active) == (b.potions, b.capture_balls, b.active)
+    assert a.party == b.party
+    assert a.edits == b.edits
+    assert a.generation == b.generation
+
+
+def test_save_round_trip(tmp_path):
+    path = str(tmp_path / "save.pbsave")
+    write_atomic(path, encode_save(sample()))
+    assert_same(read_save(path), sample())
+
+
+def test_truncated_save_is_rejected():
+    buf = encode_save(sample())
+    with pytest.raises(ValueError):
+        decode_save(buf[:len(buf) // 2])
+    with pytest.raises(ValueError):
+        decode_save(b"NOPE" + buf[4:])
+
+
+def test_journal_replays_over_snapshot(tmp_path):
+    path = str(tmp_path / "save.pbsave")
+    data = sample()
+    j = Journal(path, data.generation)
+    j.append(tile_record("route1", 1, 2, 9))
+    j.append(items_record(0, 5))
+    j.append(party_record(0, [("Raven", 20)]))
+    j.append(location_record("cave", 1.0, 2.0, "up"))
+    j.close()
+
+    assert replay_journals(path, data) == 4
+    assert data.edits["route1"][(1, 2)] == 9
+    assert (data.potions, data.capture_balls) == (0, 5)
+    assert (data.active, data.party) == (0, [("Raven", 20)])
+    assert (data.map_name, data.x, data.y, data.facing) == ("cave", 1.0, 2.0, "up")
+
+
+def test_journal_stops_at_torn_record(tmp_path):
+    path = str(tmp_path / "x.jnl")
+    good, bad = frame(items_record(1, 1)), frame(items_record(2, 2))
+    with open(path, "wb") as f:
+        f.write(good + bad[:-1])
+    assert list(read_records(path)) == [items_record(1, 1)]
+
+
+def test_older_journals_are_skipped(tmp_path):
+    path = str(tmp_path / "save.pbsave")
+    with open(journal_path(path, 3), "wb") as f:
+        f.write(frame(items_record(9, 9)))
+    data = sample()
+    assert replay_journals(path, data) == 4
+    assert (data.potions, data.capture_balls) == (3, 2)
@@ -0,0 +1,193 @@
+"""Monte Carlo balance runner.
+
+Runs N seeded battles for every (player species, enemy species) pair and
+every capture-ball scenario, spread over all cores, and prints win rates,
+mean turns and damage distributions.
+
+    python -m tools.balance --battles 20000 --seed 7 --balls 0 1 3
+
+Results depend only on --seed / --battles / --chunk, never on --workers.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from game.config import SPECIES_PATH
+from game.engine import (
+    Fighter, simulate, random_policy, strongest_policy, capture_policy,
+    WIN, LOSS, CAPTURED, TIMEOUT,
+)
+from game.species import load_species_table
+
+OUTCOMES = (WIN, LOSS, CAPTURED, TIMEOUT)
+POLICIES = {"random": random_policy, "strongest": strongest_policy}
+
+CHUNK = 5000   # battles per task
+
+_tables = {}   # per-process species tables, keyed by path
+
+
+# ---------- WORKER ----------
+
+def run_chunk(task):
+    """Simulate one chunk of battles; runs inside a worker process."""
+    species_path, a, b, balls, policy, capture_at, seed, chunk_index, n = task
+
+    table = _tables.get(species_path)
+    if table is None:
+        table = _tables[species_path] = load_species_table(species_path)
+    player = Fighter.from_species(table[a])
+    enemy = Fighter.from_species(table[b])
+
+    move_policy = POLICIES[policy]
+    player_policy = capture_policy(capture_at, move_policy) if balls else move_policy
+
+    # String seeds are hashed deterministically (unlike hash() of a tuple)
+    rng = random.Random(f"{seed}:{a}:{b}:{balls}:{chunk_index}")
+
+    outcomes = Counter()
+    turns = 0
+    dealt_p = Counter()
+    dealt_e = Counter()
+    for _ in range(n):
+        outcome, t, dp, de = simulate(player, enemy, player_policy, random_policy, rng, balls)
+        outcomes[outcome] += 1
+        turns += t
+        dealt_p[dp] += 1
+        dealt_e[de] += 1
+
+    return (a, b, balls), n, outcomes, turns, dealt_p, dealt_e
+
+
+# ---------- AGGREGATION ----------
+
+def percentile(hist, q):
+    total = sum(hist.values())
+    if not total:
+        return 0
+    target = q * (total - 1)
+    seen = 0
+    for value in sorted(hist):
+        seen += hist[value]
+        if seen > target:
+            return value
+    return max(hist)
+
+
+def summarize(hist):
+    total = sum(hist.values())
+    mean = sum(v * c for v, c in hist.items()) / total if total else 0.0
+    return {
+        "mean": round(mean, 2),
+        "p5": percentile(hist, 0.05),
+        "p50": percentile(hist, 0.50),
+        "p95": percentile(hist, 0.95),
+        "min": min(hist) if hist else 0,
+        "max": max(hist) if hist else 0,
+    }
+
+
+def make_tasks(names, balls_list, battles, seed, policy, capture_at, species_path, chunk=CHUNK):
+    tasks = []
+    for a in names:
+        for b in names:
+            for balls in balls_list:
+                left, index = battles, 0
+                while left > 0:
+                    n = min(chunk, left)
+                    tasks.append((species_path, a, b, balls, policy, capture_at, seed, index, n))
+                    left -= n
+                    index += 1
+    return tasks
+
+
+def run(names, balls_list, battles, seed, policy="random", capture_at=0.5,
+        workers=None, species_path=SPECIES_PATH, chunk=CHUNK):
+    tasks = make_tasks(names, balls_list, battles, seed, policy, capture_at, species_path, chunk)
+
+    acc = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for key, n, outcomes, turns, dealt_p, dealt_e in pool.map(run_chunk, tasks):
+            entry = acc.setdefault(key, [0, Counter(), 0, Counter(), Counter()])
+            entry[0] += n
+            entry[1].update(outcomes)
+            entry[2] += turns
+            entry[3].update(dealt_p)
+            entry[4].update(dealt_e)
+
+    results = []
+    for (a, b, balls), (n, outcomes, turns, dealt_p, dealt_e) in sorted(acc.items()):
+        results.append({
+            "player": a,
+            "enemy": b,
+            "balls": balls,
+            "battles": n,
+            "rates": {o: round(outcomes[o] / n, 4) for o in OUTCOMES},
+            "mean_turns": round(turns / n, 3),
+            "damage_by_player": summarize(dealt_p),
+            "damage_by_enemy": summarize(dealt_e),
+        })
+    return results
+
+
+def print_table(results):
+    header = (f"{'player':<10} {'enemy':<10} {'balls':>5} {'win%':>7} {'loss%':>7} "
+              f"{'capt%':>7} {'turns':>6}  {'dmg dealt p5/p50/p95':>22}  {'dmg taken p5/p50/p95':>22}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        rates = r["rates"]
+        dp, de = r["damage_by_player"], r["damage_by_enemy"]
+        print(f"{r['player']:<10} {r['enemy']:<10} {r['balls']:>5} "
+              f"{rates[WIN] * 100:>6.2f}% {rates[LOSS] * 100:>6.2f}% {rates[CAPTURED] * 100:>6.2f}% "
+              f"{r['mean_turns']:>6.2f}  "
+              f"{dp['p5']:>6}/{dp['p50']:>6}/{dp['p95']:>6}    "
+              f"{de['p5']:>6}/{de['p50']:>6}/{de['p95']:>6}")
+
+
+# ---------- CLI ----------
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo balance runner over species matchups")
+    parser.add_argument("--battles", type=int, default=10000, help="battles per matchup and scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--balls", type=int, nargs="+", default=[0, 1, 3],
+                        help="capture-ball scenarios (balls available to the player)")
+    parser.add_argument("--capture-at", type=float, default=0.5,
+                        help="throw balls once enemy HP is at or below this fraction")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random",
+                        help="how the player picks moves")
+    parser.add_argument("--species", nargs="+", help="limit to these species (default: all)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="battles per worker task")
+    parser.add_argument("--data", default=SPECIES_PATH, help="species table")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    table = load_species_table(args.data)
+    names = args.species or [s.name for s in table.species]
+    for name in names:
+        if name not in table.by_name:
+            parser.error(f"unknown species {name!r}")
+
+    start = time.perf_counter()
+    results = run(names, args.balls, args.battles, args.seed, args.policy,
+                  args.capture_at, args.workers, args.data, args.chunk)
+    elapsed = time.perf_counter() - start
+
+    print_table(results)
+    total = sum(r["battles"] for r in results)
+    print(f"\n{total} battles in {elapsed:.2f}s ({total / elapsed:,.0f}/s) on {args.workers} workers")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"seed": args.seed, "battles": args.battles, "results": results}, f, indent=2)
+        print(f"Saved results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Headless benchmark suite for the overworld, battle and editor hot paths.
+
+Runs under SDL's dummy video driver (no window). Each benchmark reports
+ops/sec and memory allocated per op, and is compared against a stored
+baseline; a benchmark slower than baseline by more than --tolerance fails
+the run (exit code 1).
+
+    python -m tools.bench                    # run + compare
+    python -m tools.bench --save-baseline    # run + store as new baseline
+    python -m tools.bench -k overworld       # only matching benchmarks
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from game.config import SCREEN_W, SCREEN_H, BASE_GRASS_TILE, BLOCKING_TILES
+
+BASELINE_PATH = os.path.join("tools", "bench_baseline.json")
+MIN_TIME = 0.5          # seconds each benchmark is timed for
+ALLOC_OPS = 20          # ops traced with tracemalloc for the allocation figure
+
+
+# ---------- FIXTURES ----------
+
+_screen = None
+_overworld = None
+
+
+def screen():
+    global _screen
+    if _screen is None:
+        pygame.init()
+        _screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    return _screen
+
+
+def overworld():
+    global _overworld
+    if _overworld is None:
+        from game.overworld import Overworld
+        random.seed(0)
+        _overworld = Overworld(screen(), save_path=None)
+    return _overworld
+
+
+def make_map(w, h, seed=0):
+    """Random w x h map of non-blocking tiles, mostly grass."""
+    rng = random.Random(seed)
+    num = len(overworld().tiles)
+    ids = [t for t in range(num) if t not in BLOCKING_TILES]
+    return [[rng.choice(ids) if rng.random() < 0.3 else BASE_GRASS_TILE for _ in range(w)]
+            for _ in range(h)]
+
+
+def make_party(n):
+    from game.creatures import Creature
+    from game.inventory import Inventory
+    from game.species import species_table
+
+    table = species_table()
+    inv = Inventory()
+    for i in range(n):
+        inv.add_to_party(Creature(table.species[i % len(table.species)]))
+    inv.potions = 3
+    inv.capture_balls = 5
+    return inv
+
+
+# ---------- BENCHMARKS ----------
+# Each factory does its setup and returns the op to time.
+
+def bench_overworld_draw(w, h):
+    def setup():
+        ow = overworld()
+        ow.set_world(make_map(w, h))
+        ow.mode = "world"
+        ow.battle = None
+        positions = [(x * 32 * 3 % (w * 32 - 32), y * 32 * 2 % (h * 32 - 32))
+                     for x, y in zip(range(64), range(0, 128, 2))]
+        state = {"i": 0}
+
+        def op():
+            # walk the camera around so chunks get built and evicted
+            x, y = positions[state["i"] % len(positions)]
+            state["i"] += 1
+            ow.player.teleport(x, y)
+            ow.invalidate()
+            ow.draw()
+        return op
+    return setup
+
+
+def bench_load_tiles():
+    ow = overworld()
+    return ow.load_tiles
+
+
+def bench_load_map():
+    ow = overworld()
+    start = ow.graph.start[0]
+    return lambda: ow.maps.load(start)
+
+
+def bench_battle_draw(party_size):
+    def setup():
+        from game.battle import Battle
+        from game.creatures import create_random_enemy
+
+        inv = make_party(party_size)
+        battle = Battle(screen(), inv, create_random_enemy(random.Random(1)))
+        return battle.draw
+    return setup
+
+
+def bench_party_menu_draw(party_size):
+    def setup():
+        from game.party import PartyMenu
+
+        inv = make_party(party_size)
+        menu = PartyMenu()
+        menu.open = True
+        scr = screen()
+        return lambda: menu.draw(scr, SCREEN_W, SCREEN_H, inv)
+    return setup
+
+
+def bench_editor_redraw():
+    from tools import map_editor
+
+    scr = screen()
+    tiles = map_editor.load_tilesheet(map_editor.TILE_SHEET_PATH)
+    grid = map_editor.load_map(map_editor.MAP_PATH)
+    return lambda: map_editor.draw_map_area(scr, grid, tiles)
+
+
+BENCHMARKS = {
+    "overworld_draw_20x15": bench_overworld_draw(20, 15),
+    "overworld_draw_200x200": bench_overworld_draw(200, 200),
+    "overworld_draw_1000x1000": bench_overworld_draw(1000, 1000),
+    "startup_load_tiles": bench_load_tiles,
+    "startup_load_map": bench_load_map,
+    "battle_draw_party1": bench_battle_draw(1),
+    "battle_draw_party6": bench_battle_draw(6),
+    "battle_draw_party30": bench_battle_draw(30),
+    "party_menu_draw_1": bench_party_menu_draw(1),
+    "party_menu_draw_6": bench_party_menu_draw(6),
+    "editor_full_redraw": bench_editor_redraw,
+}
+
+
+# ---------- RUNNER ----------
+
+def measure(op, min_time=MIN_TIME):
+    op()   # warm caches
+    n = 0
+    start = time.perf_counter()
+    while True:
+        op()
+        n += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(ALLOC_OPS):
+        op()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": n / elapsed,
+        "alloc_peak_kb_per_op": max(0, peak - before) / 1024 / ALLOC_OPS,
+        "retained_kb_per_op": max(0, after - before) / 1024 / ALLOC_OPS,
+    }
+
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        ratio = r["ops_per_sec"] / base["ops_per_sec"]
+        r["vs_baseline"] = ratio
+        if ratio < 1 - tolerance:
+            failures.append((name, ratio))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark suite")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown vs baseline before failing (0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'benchmark':<28}{'ops/sec':>12}{'alloc KB/op':>14}{'kept KB/op':>12}{'vs base':>10}")
+    for name, factory in BENCHMARKS.items():
+        if args.pattern and args.pattern not in name:
+            continue
+        r = measure(factory(), args.min_time)
+        results[name] = r
+        compare({name: r}, baseline, args.tolerance)
+        vs = f"{r['vs_baseline']:.2f}x" if "vs_baseline" in r else "-"
+        print(f"{name:<28}{r['ops_per_sec']:>12.1f}{r['alloc_peak_kb_per_op']:>14.1f}"
+              f"{r['retained_kb_per_op']:>12.2f}{vs:>10}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baseline.update(results)
+        for r in baseline.values():
+            r.pop("vs_baseline", None)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    failures = compare(results, baseline, args.tolerance)
+    if not baseline:
+        print("No baseline yet (run with --save-baseline).")
+    for name, ratio in failures:
+        print(f"REGRESSION {name}: {ratio:.2f}x of baseline")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
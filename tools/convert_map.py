@@ -0,0 +1,79 @@
+"""Convert maps between CSV and the binary .pbmap format.
+
+    python -m tools.convert_map assets/maps/route1.csv              # -> route1.pbmap
+    python -m tools.convert_map ground.csv deco.csv -o town.pbmap   # CSVs become layers
+    python -m tools.convert_map assets/maps/route1.pbmap            # -> route1.csv (+ .layerN.csv)
+    python -m tools.convert_map big.pbmap --regions 64 -o big/      # region dir for streaming
+"""
+import argparse
+import json
+import os
+import sys
+
+from game.mapfile import read_map, write_map, read_csv_map, write_csv_map, load_grid
+
+
+def csv_to_pbmap(inputs, out):
+    layers = [read_csv_map(p) for p in inputs]
+    write_map(out, layers)
+    m = layers[0]
+    print(f"Wrote {out}: {len(m[0]) if m else 0}x{len(m)}, {len(layers)} layer(s)")
+
+
+def pbmap_to_csv(path, out):
+    data = read_map(path)
+    stem = os.path.splitext(out)[0]
+    for i in range(data.layers):
+        target = out if i == 0 else f"{stem}.layer{i}.csv"
+        write_csv_map(target, data.layer(i))
+        print(f"Wrote {target}: {data.width}x{data.height}")
+
+
+def split_regions(path, out, n, fill):
+    """Cut layer 0 of a map into n x n region files for game.streaming."""
+    grid = load_grid(path)
+    h = len(grid)
+    w = len(grid[0]) if h else 0
+    os.makedirs(out, exist_ok=True)
+    written = 0
+    for ry in range((h + n - 1) // n):
+        for rx in range((w + n - 1) // n):
+            block = [list(row[rx * n:(rx + 1) * n]) for row in grid[ry * n:(ry + 1) * n]]
+            target = os.path.join(out, f"{rx}_{ry}.pbmap")
+            if all(t == fill for row in block for t in row):
+                # all-fill regions need no file
+                if os.path.exists(target):
+                    os.remove(target)
+                continue
+            write_map(target, [block])
+            written += 1
+    with open(os.path.join(out, "regions.json"), "w") as f:
+        json.dump({"width": w, "height": h, "region_tiles": n, "fill": fill}, f, indent=2)
+    print(f"Wrote {out}: {w}x{h} in {n}x{n} regions ({written} files)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert maps between CSV and .pbmap")
+    parser.add_argument("inputs", nargs="+", help="CSV layer files, or a single .pbmap")
+    parser.add_argument("-o", "--out", help="output path (default: first input with the other extension)")
+    parser.add_argument("--regions", type=int, metavar="N",
+                        help="split into N x N tile regions for streaming (output is a directory)")
+    parser.add_argument("--fill", type=int, default=0, help="tile ID of regions with no file (--regions)")
+    args = parser.parse_args()
+
+    first = args.inputs[0]
+    if args.regions:
+        if len(args.inputs) > 1:
+            parser.error("--regions takes a single map")
+        split_regions(first, args.out or os.path.splitext(first)[0] + "_regions", args.regions, args.fill)
+    elif first.endswith(".pbmap"):
+        if len(args.inputs) > 1:
+            parser.error("convert one .pbmap at a time")
+        pbmap_to_csv(first, args.out or os.path.splitext(first)[0] + ".csv")
+    else:
+        csv_to_pbmap(args.inputs, args.out or os.path.splitext(first)[0] + ".pbmap")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 import pygame
-import csv
 import os
 
+from game.mapfile import load_grid, write_map
+
 # ----- CONFIG -----
 
 TILE_SIZE = 32              # real tile size in tileset & game
@@ -10,7 +11,7 @@ GRID_W, GRID_H = 20, 15     # map size in tiles
 ASSETS_DIR = "assets"
 MAPS_DIR = os.path.join(ASSETS_DIR, "maps")
 TILE_SHEET_PATH = os.path.join(ASSETS_DIR, "tiles", "tileset.png")
-MAP_PATH = os.path.join(MAPS_DIR, "route1.csv")
+MAP_PATH = os.path.join(MAPS_DIR, "route1.pbmap")
 
 FPS = 60
 
@@ -41,17 +42,12 @@ def load_tilesheet(path):
 
 
 def load_map(path):
-    """Load CSV map, pad/crop to proper size."""
+    """Load a .pbmap (or legacy CSV) map, pad/crop to proper size."""
     if not os.path.exists(path):
         return [[0 for _ in range(GRID_W)] for _ in range(GRID_H)]
 
-    grid = []
-    with open(path, "r") as f:
-        reader = csv.reader(f)
-        for row in reader:
-            if not row:
-                continue
-            grid.append([int(x) for x in row])
+    # editable lists; the file mapping is released once these are copied
+    grid = [list(row) for row in load_grid(path)]
 
     # Ensure correct height
     grid = grid[:GRID_H]
@@ -69,12 +65,9 @@ def load_map(path):
 
 
 def save_map(grid, path):
-    """Save grid back to CSV."""
+    """Save grid back as a binary .pbmap."""
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", newline="") as f:
-        writer = csv.writer(f)
-        for row in grid:
-            writer.writerow(row)
+    write_map(path, [grid])
     print(f"Saved map to {path}")
 
 
@@ -88,6 +81,28 @@ def add_rotated_tile(tiles, tile_id):
     return new_id
 
 
+def draw_map_area(screen, grid, tiles):
+    """Draw every map cell (scaled to editor size) plus grid lines."""
+    for y in range(len(grid)):
+        for x in range(len(grid[y])):
+            tid = grid[y][x]
+            if 0 <= tid < len(tiles):
+                # Scale tile to editor display size
+                tile_img = pygame.transform.scale(
+                    tiles[tid],
+                    (EDITOR_TILE_SIZE, EDITOR_TILE_SIZE)
+                )
+                screen.blit(tile_img, (x * EDITOR_TILE_SIZE, y * EDITOR_TILE_SIZE))
+
+            # grid lines
+            pygame.draw.rect(
+                screen, (0, 0, 0),
+                (x * EDITOR_TILE_SIZE, y * EDITOR_TILE_SIZE,
+                 EDITOR_TILE_SIZE, EDITOR_TILE_SIZE),
+                1
+            )
+
+
 # ---------- MAIN EDITOR ----------
 
 def main():
@@ -235,24 +250,7 @@ def main():
         screen.fill((30, 30, 30))
 
         # --- Draw map area (left) ---
-        for y in range(GRID_H):
-            for x in range(GRID_W):
-                tid = grid[y][x]
-                if 0 <= tid < len(tiles):
-                    # Scale tile to editor display size
-                    tile_img = pygame.transform.scale(
-                        tiles[tid],
-                        (EDITOR_TILE_SIZE, EDITOR_TILE_SIZE)
-                    )
-                    screen.blit(tile_img, (x * EDITOR_TILE_SIZE, y * EDITOR_TILE_SIZE))
-
-                # grid lines
-                pygame.draw.rect(
-                    screen, (0, 0, 0),
-                    (x * EDITOR_TILE_SIZE, y * EDITOR_TILE_SIZE,
-                     EDITOR_TILE_SIZE, EDITOR_TILE_SIZE),
-                    1
-                )
+        draw_map_area(screen, grid, tiles)
 
         # --- Draw palette panel background (right) ---
         palette_x = map_pixel_w
@@ -0,0 +1,100 @@
+"""Replay a recorded session headlessly, as fast as possible.
+
+Record a session, then replay it to get a frame-time trace and a hash of
+the final game state (same recording + same code = same hash):
+
+    python -m game.main --record session.pbrec
+    python -m tools.replay session.pbrec --trace trace.csv
+    python -m tools.replay session.pbrec --sections sections.csv   # per-subsystem times
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import csv
+import random
+import sys
+import time
+
+import pygame
+
+from game.config import SCREEN_W, SCREEN_H
+from game.loop import FixedStep, KeyState
+from game.main import run_frame
+from game.overworld import Overworld
+from game.profiler import profiler
+from game.replay import load_recording, state_hash
+
+
+def percentile(data, q):
+    last = len(data) - 1
+    return data[min(last, int(q * last + 0.5))] if data else 0.0
+
+
+def replay(rec, sections=None):
+    """Run every recorded frame; returns (frame_times, final_hash)."""
+    random.seed(rec.seed)
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    stepper = FixedStep(rec.tick_rate, rec.max_steps)
+    keys = KeyState()
+    overworld = Overworld(screen, save_path=None, sync_loads=True)
+    if sections:
+        profiler.start_csv(sections)
+
+    times = []
+    idle = False
+    for frame_dt, events in rec.frames:
+        if idle:
+            stepper.reset()   # the live loop restarts timing after an idle wait
+        start = time.perf_counter()
+        running = run_frame(screen, overworld, stepper, keys, events, frame_dt)
+        times.append(time.perf_counter() - start)
+        if not running:
+            break
+        idle = overworld.is_idle(keys)
+
+    digest = state_hash(overworld)
+    profiler.stop_csv()
+    pygame.quit()
+    return times, digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session headlessly")
+    parser.add_argument("recording")
+    parser.add_argument("--trace", help="write per-frame times to this CSV")
+    parser.add_argument("--sections", help="also write the profiler's per-section CSV here")
+    parser.add_argument("--expect", help="exit 1 unless the final state hash matches")
+    args = parser.parse_args()
+
+    rec = load_recording(args.recording)
+    times, digest = replay(rec, args.sections)
+
+    if args.trace:
+        with open(args.trace, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["frame", "recorded_dt_ms", "replay_ms"])
+            for i, (t, (dt, _)) in enumerate(zip(times, rec.frames)):
+                w.writerow([i, f"{dt * 1000:.3f}", f"{t * 1000:.4f}"])
+
+    ms = sorted(t * 1000 for t in times)
+    total = sum(times)
+    worst = sorted(range(len(times)), key=times.__getitem__, reverse=True)[:5]
+    print(f"frames    {len(times)} / {len(rec.frames)}")
+    print(f"recorded  {rec.duration:.2f}s   replayed in {total:.2f}s")
+    print(f"frame ms  p50 {percentile(ms, 0.50):.3f}  p95 {percentile(ms, 0.95):.3f}  "
+          f"p99 {percentile(ms, 0.99):.3f}  max {ms[-1] if ms else 0.0:.3f}")
+    print("slowest   " + ", ".join(f"#{i} ({times[i] * 1000:.2f}ms)" for i in worst))
+    print(f"state     {digest}")
+
+    if args.expect and args.expect != digest:
+        print(f"MISMATCH: expected {args.expect}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())